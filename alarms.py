@@ -0,0 +1,233 @@
+"""
+Alarmas a una hora del reloj de pared: únicas ("14:30") o recurrentes (cron de 5 campos)
+
+La próxima hora de cada alarma se calcula directamente a partir de su regla y
+solo se programa un despertar, para la más próxima. El planificador de la
+aplicación cuenta con el reloj monotónico, que no sigue los cambios de hora y
+en algunos sistemas se detiene durante la suspensión; por eso el despertar se
+limita a MAX_SLEEP y en cada uno se compara el avance de ambos relojes para
+detectar saltos y alarmas perdidas.
+"""
+
+import bisect
+import datetime
+import time
+
+from state_journal import CLOCK_TOLERANCE
+
+# Espera máxima entre comprobaciones (acota el retraso tras una suspensión o un salto de hora)
+MAX_SLEEP = 30.0
+# Una alarma perdida hace menos de esto todavía suena; más antigua, solo se informa
+MISSED_GRACE = 3600.0
+# Días revisados en busca del próximo disparo (un 29 de febrero puede tardar 8 años)
+MAX_SEARCH_DAYS = 366 * 8
+
+def _parse_field(text, low, high):
+    """Valores de un campo de cron: "*", "5", "1-5", "*/15", "0-30/10" y listas con comas"""
+    values = set()
+    for part in text.split(","):
+        spec, _, step = part.partition("/")
+        if spec == "*":
+            start, end = low, high
+        elif "-" in spec:
+            start, end = (int(value) for value in spec.split("-", 1))
+        else:
+            start = end = int(spec)
+            if step:
+                end = high
+        step = int(step) if step else 1
+        if not low <= start <= end <= high or step < 1:
+            raise ValueError(f"campo fuera de rango: {part}")
+        values.update(range(start, end + 1, step))
+    return sorted(values)
+
+class CronRule:
+    """Regla recurrente "minuto hora día mes día-de-la-semana" (0 y 7 = domingo)"""
+
+    def __init__(self, text):
+        fields = text.split()
+        if len(fields) != 5:
+            raise ValueError("una regla de cron tiene 5 campos")
+        self.text = text
+        self.minutes = _parse_field(fields[0], 0, 59)
+        self.hours = _parse_field(fields[1], 0, 23)
+        self.days = set(_parse_field(fields[2], 1, 31))
+        self.months = set(_parse_field(fields[3], 1, 12))
+        self.weekdays = {day % 7 for day in _parse_field(fields[4], 0, 7)}
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    def matches_day(self, date):
+        """True si la regla dispara algún minuto de `date`"""
+        if date.month not in self.months:
+            return False
+        day = date.day in self.days
+        weekday = date.isoweekday() % 7 in self.weekdays
+        # Como en cron: con día y día de la semana restringidos basta con uno
+        if self.any_day:
+            return weekday
+        if self.any_weekday:
+            return day
+        return day or weekday
+
+    def next_after(self, timestamp):
+        """Primer disparo estrictamente posterior a `timestamp` (reloj de pared), o None"""
+        start = datetime.datetime.fromtimestamp(timestamp).replace(second=0, microsecond=0)
+        start += datetime.timedelta(minutes=1)
+        date = start.date()
+        for _ in range(MAX_SEARCH_DAYS):
+            if self.matches_day(date):
+                first = (start.hour, start.minute) if date == start.date() else (0, 0)
+                moment = self._first_in_day(*first)
+                if moment is not None:
+                    return datetime.datetime.combine(date, moment).timestamp()
+            date += datetime.timedelta(days=1)
+        return None
+
+    def _first_in_day(self, hour, minute):
+        """Primera (hora, minuto) de la regla desde hour:minute en un mismo día"""
+        index = bisect.bisect_left(self.hours, hour)
+        if index == len(self.hours):
+            return None
+        if self.hours[index] == hour:
+            position = bisect.bisect_left(self.minutes, minute)
+            if position < len(self.minutes):
+                return datetime.time(hour, self.minutes[position])
+            index += 1
+            if index == len(self.hours):
+                return None
+        return datetime.time(self.hours[index], self.minutes[0])
+
+def parse_alarm(spec, now=None):
+    """(regla o None, primer disparo) de "HH:MM[:SS]", "AAAA-MM-DD HH:MM" o una regla de cron"""
+    if now is None:
+        now = time.time()
+    spec = spec.strip()
+    if len(spec.split()) == 5:
+        rule = CronRule(spec)
+        first = rule.next_after(now)
+        if first is None:
+            raise ValueError("la regla nunca dispara")
+        return rule, first
+
+    for pattern in ("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S"):
+        try:
+            moment = datetime.datetime.strptime(spec, pattern)
+        except ValueError:
+            continue
+        if moment.timestamp() <= now:
+            raise ValueError("esa hora ya pasó")
+        return None, moment.timestamp()
+
+    for pattern in ("%H:%M", "%H:%M:%S"):
+        try:
+            clock = datetime.datetime.strptime(spec, pattern).time()
+        except ValueError:
+            continue
+        # Hoy a esa hora, o mañana si ya pasó
+        today = datetime.datetime.fromtimestamp(now).date()
+        moment = datetime.datetime.combine(today, clock)
+        if moment.timestamp() <= now:
+            moment = datetime.datetime.combine(today + datetime.timedelta(days=1), clock)
+        return None, moment.timestamp()
+    raise ValueError(f"hora no reconocida: {spec}")
+
+class Alarm:
+    """Alarma con nombre; `next` es su próximo disparo en el reloj de pared"""
+
+    __slots__ = ("name", "spec", "rule", "next")
+
+    def __init__(self, name, spec, rule, next_fire):
+        self.name = name
+        self.spec = spec
+        self.rule = rule
+        self.next = next_fire
+
+class AlarmBook:
+    """Alarmas por nombre; solo la más próxima importa para despertar"""
+
+    def __init__(self, wall=time.time, mono=time.monotonic):
+        self.wall = wall
+        self.mono = mono
+        self._alarms = {}
+        self._anchor = (wall(), mono())
+
+    def __len__(self):
+        return len(self._alarms)
+
+    def __contains__(self, name):
+        return name in self._alarms
+
+    def add(self, name, spec):
+        """Agrega (o reemplaza) una alarma y devuelve su primer disparo"""
+        rule, first = parse_alarm(spec, self.wall())
+        self._alarms[name] = Alarm(name, spec, rule, first)
+        return first
+
+    def cancel(self, name):
+        """Elimina una alarma"""
+        return self._alarms.pop(name, None) is not None
+
+    def snapshot(self, name):
+        """Estado serializable de una alarma, o None si ya no existe"""
+        alarm = self._alarms.get(name)
+        if alarm is None:
+            return None
+        return {"spec": alarm.spec, "next": alarm.next}
+
+    def restore(self, name, snapshot):
+        """Vuelve a cargar una alarma guardada (con su próximo disparo, aunque ya haya pasado)"""
+        rule = CronRule(snapshot["spec"]) if len(snapshot["spec"].split()) == 5 else None
+        self._alarms[name] = Alarm(name, snapshot["spec"], rule, snapshot["next"])
+
+    def next_fire(self):
+        """Próximo disparo en el reloj de pared, o None si no hay alarmas"""
+        return min((alarm.next for alarm in self._alarms.values()), default=None)
+
+    def wakeup_delay(self):
+        """Segundos hasta el próximo despertar (a lo sumo MAX_SLEEP), o None"""
+        next_fire = self.next_fire()
+        if next_fire is None:
+            return None
+        return max(0.0, min(MAX_SLEEP, next_fire - self.wall()))
+
+    def check(self):
+        """Procesa las alarmas vencidas; devuelve (sonaron, perdidas, hubo_salto)
+
+        `sonaron` son pares (nombre, retraso en segundos). Una alarma recurrente
+        que se perdió varias veces (suspensión, app cerrada) suena una sola vez
+        y sigue en su próximo disparo posterior a ahora.
+        """
+        wall, mono = self.wall(), self.mono()
+        wall_start, mono_start = self._anchor
+        self._anchor = (wall, mono)
+        # Los dos relojes avanzan juntos salvo suspensión o cambio de hora
+        jumped = abs((wall - wall_start) - (mono - mono_start)) > CLOCK_TOLERANCE
+
+        fired, missed = [], []
+        for alarm in list(self._alarms.values()):
+            if alarm.next > wall:
+                if jumped and alarm.rule is not None:
+                    # La hora retrocedió: puede haber un disparo anterior al calculado
+                    alarm.next = alarm.rule.next_after(wall)
+                    if alarm.next is None:
+                        del self._alarms[alarm.name]
+                continue
+
+            late = wall - alarm.next
+            if late <= MISSED_GRACE:
+                fired.append((alarm.name, late))
+            elif alarm.rule is None:
+                missed.append(alarm.name)
+
+            if alarm.rule is None:
+                del self._alarms[alarm.name]
+            else:
+                alarm.next = alarm.rule.next_after(wall)
+                if alarm.next is None:
+                    del self._alarms[alarm.name]
+        return fired, missed, jumped
+
+    def upcoming(self, count):
+        """Las `count` alarmas más próximas como Alarm"""
+        return sorted(self._alarms.values(), key=lambda alarm: alarm.next)[:count]
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memoria residente (RSS) del Temporizador & Cronómetro
+
+Cada modo se mide en un proceso nuevo (el intérprete no siempre devuelve al
+sistema la memoria liberada, así que medir todo en un mismo proceso engaña):
+
+    window           ventana visible con todas las pestañas construidas
+    tray             minimizado al tray con la ventana viva
+    tray-low-memory  minimizado al tray con config.TRAY_LOW_MEMORY (vista destruida)
+
+Requiere display. Uso:
+    python benchmark_memory.py
+    python benchmark_memory.py --laps 5000 --output memoria.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import config
+
+MODES = ("window", "tray", "tray-low-memory")
+
+def rss_bytes():
+    """Memoria residente actual del proceso (en bytes)"""
+    if sys.platform.startswith("win"):
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb
+        )
+        return counters.WorkingSetSize
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # macOS: solo está el pico (ru_maxrss en bytes)
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def pump(app, seconds):
+    """Deja correr el bucle de Tk durante `seconds` segundos"""
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        app.root.update()
+        time.sleep(0.01)
+
+def measure(mode, laps, settle):
+    """Mide un modo dentro de este proceso y devuelve el resultado"""
+    config.TRAY_LOW_MEMORY = mode == "tray-low-memory"
+    # No tocar el diario de estado real del usuario
+    os.environ["XDG_STATE_HOME"] = os.environ["APPDATA"] = tempfile.mkdtemp(prefix="temporizador-")
+    config.CONTROL_API_ENABLED = False
+
+    from timer_app import TimerApp
+    app = TimerApp()
+
+    # Estado realista: relojes corriendo, vueltas y todas las pestañas abiertas
+    app.start_timer_for(3600)
+    app.start_stopwatch()
+    for _ in range(laps):
+        app.stopwatch.lap()
+    app.build_stopwatch_tab()
+    app.build_multi_timer_tab()
+    pump(app, settle)
+
+    if mode != "window":
+        app.minimize_to_tray()
+        pump(app, settle)
+
+    gc.collect()
+    rss = rss_bytes()
+
+    start = time.perf_counter()
+    app._show_window()
+    app.root.update()
+    restore_ms = (time.perf_counter() - start) * 1000 if mode != "window" else None
+
+    if app.tray:
+        app.tray.stop()
+    return {"mode": mode, "rss_mb": round(rss / 2 ** 20, 2), "restore_ms": restore_ms}
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Benchmark de memoria residente")
+    parser.add_argument("--laps", type=int, default=1000, help="vueltas registradas antes de medir")
+    parser.add_argument("--settle", type=float, default=2.0, help="segundos de espera antes de medir")
+    parser.add_argument("--output", help="archivo JSON de salida (por defecto stdout)")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)  # proceso hijo
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(measure(args.mode, args.laps, args.settle)))
+        sys.stdout.flush()
+        os._exit(0)
+
+    results = []
+    for mode in MODES:
+        print(f"📏 Midiendo {mode}...", file=sys.stderr)
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--mode", mode,
+             "--laps", str(args.laps), "--settle", str(args.settle)],
+            stdout=subprocess.PIPE, check=True, universal_newlines=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    report = {
+        "app_version": config.APP_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "laps": args.laps,
+        "runs": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"✅ Resultados guardados en {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Benchmark de precisión y costo de los relojes del Temporizador & Cronómetro
+
+Ejecuta cuentas regresivas de varias duraciones (con el cronómetro corriendo
+al mismo tiempo) sobre el mismo camino que usa la aplicación: timer_core.Timer,
+timer_core.Stopwatch, MainLoopScheduler y las mismas funciones de timer_core
+que calculan cada tick (modo del display, ventana minimizada, programas de
+intervalos). Escribe los resultados en JSON.
+
+Uso:
+    python benchmark_timing.py                      # bucle propio, sin display
+    python benchmark_timing.py --tk                 # bucle real de Tk
+    python benchmark_timing.py --durations 5 60 --output resultados.json
+    python benchmark_timing.py --stopwatch milliseconds --minimized
+    python benchmark_timing.py --program "HIIT 20/10"
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import platform
+import sys
+import time
+
+import config
+from intervals import compile_programs
+from timer_core import (
+    Timer, Stopwatch, MainLoopScheduler, STOPWATCH_SCALES,
+    timer_phase, timer_tick_delay, stopwatch_step, stopwatch_tick_delay,
+)
+
+class LoopHost:
+    """Bucle de eventos mínimo con after/after_cancel, equivalente al de Tk"""
+
+    def __init__(self):
+        self._queue = []
+        self._ids = itertools.count()
+        self._cancelled = set()
+        self._stopped = False
+
+    def after(self, delay_ms, callback):
+        job_id = next(self._ids)
+        heapq.heappush(self._queue, (time.monotonic() + delay_ms / 1000, job_id, callback))
+        return job_id
+
+    def after_cancel(self, job_id):
+        self._cancelled.add(job_id)
+
+    def pending(self):
+        """Callbacks en espera (profundidad de la cola de eventos)"""
+        return len(self._queue) - len(self._cancelled)
+
+    def quit(self):
+        self._stopped = True
+
+    def mainloop(self):
+        self._stopped = False
+        while not self._stopped and self._queue:
+            when, job_id, callback = self._queue[0]
+            delay = when - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+                continue
+            heapq.heappop(self._queue)
+            if job_id in self._cancelled:
+                self._cancelled.discard(job_id)
+                continue
+            callback()
+
+class TkHost:
+    """Raíz de Tk oculta; la profundidad se lee de `after info`"""
+
+    def __init__(self):
+        import tkinter as tk
+        self.root = tk.Tk()
+        self.root.withdraw()
+
+    def after(self, delay_ms, callback):
+        return self.root.after(delay_ms, callback)
+
+    def after_cancel(self, job_id):
+        self.root.after_cancel(job_id)
+
+    def pending(self):
+        return len(self.root.tk.splitlist(self.root.tk.call("after", "info")))
+
+    def quit(self):
+        self.root.quit()
+
+    def mainloop(self):
+        self.root.mainloop()
+
+class CountingHost:
+    """Envuelve un host para contar despertares y muestrear las colas antes de atender cada uno"""
+
+    def __init__(self, host):
+        self.host = host
+        self.scheduler = None
+        self.wakeups = 0
+        self.host_depths = []
+        self.job_depths = []
+
+    def after(self, delay_ms, callback):
+        def wrapped():
+            self.wakeups += 1
+            # El host ya quitó este evento de su cola: se cuenta como pendiente
+            self.host_depths.append(self.host.pending() + 1)
+            if self.scheduler is not None:
+                self.job_depths.append(len(self.scheduler))
+            callback()
+        return self.host.after(delay_ms, wrapped)
+
+    def after_cancel(self, job_id):
+        self.host.after_cancel(job_id)
+
+def percentiles(values, points=(50, 90, 99)):
+    """Percentiles por rango más cercano (sin dependencias externas)"""
+    if not values:
+        return {f"p{p}": None for p in points}
+    ordered = sorted(values)
+    result = {}
+    for p in points:
+        index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+        result[f"p{p}"] = ordered[index]
+    result["max"] = ordered[-1]
+    return result
+
+def depth_stats(depths):
+    return {
+        "mean": sum(depths) / len(depths) if depths else 0,
+        "max": max(depths, default=0),
+    }
+
+def run_countdown(host, duration, program=None, stopwatch_mode="tenths", minimized=False):
+    """Ejecuta una cuenta regresiva (o un programa) con el cronómetro en paralelo y mide todo"""
+    counting = CountingHost(host)
+    scheduler = MainLoopScheduler(counting)
+    counting.scheduler = scheduler
+    timer = Timer()
+    stopwatch = Stopwatch()
+    # Como en la aplicación: minimizada, el cronómetro no hace ticks
+    step = None if minimized else stopwatch_step(STOPWATCH_SCALES[stopwatch_mode], config.CLOCK_FPS)
+    if program is not None:
+        duration = program.total
+    timer_lateness = []
+    stopwatch_lateness = []
+    finish = {}
+
+    def timer_tick():
+        # Retraso respecto del segundo entero (de la fase, con un programa) que se esperaba
+        phase = timer_phase(timer, program)
+        remaining = timer.remaining() if phase is None else phase[2]
+        timer_lateness.append((round(remaining) - remaining) * 1000)
+        if timer.expired():
+            finish["at"] = time.monotonic()
+            stopwatch.pause()
+            host.quit()
+        else:
+            scheduler.call_later(timer_tick_delay(timer, program, minimized), timer_tick)
+
+    def stopwatch_tick():
+        if not stopwatch.running:
+            return
+        elapsed_ns = stopwatch.elapsed_ns()
+        elapsed = elapsed_ns / 1e9
+        stopwatch_lateness.append((elapsed - round(elapsed / step) * step) * 1000)
+        scheduler.call_later(stopwatch_tick_delay(elapsed_ns, step), stopwatch_tick)
+
+    cpu_start = time.process_time()
+    start = time.monotonic()
+    timer.start(duration)
+    stopwatch.start()
+    scheduler.call_later(timer_tick_delay(timer, program, minimized), timer_tick)
+    if step is not None:
+        scheduler.call_later(step, stopwatch_tick)
+    host.mainloop()
+    wall = time.monotonic() - start
+    cpu = time.process_time() - cpu_start
+
+    return {
+        "duration_s": duration,
+        "program": program.name if program is not None else None,
+        "stopwatch_mode": None if minimized else stopwatch_mode,
+        "minimized": minimized,
+        "drift_ms": (finish["at"] - (start + duration)) * 1000,
+        "timer_tick_jitter_ms": percentiles(timer_lateness),
+        "stopwatch_tick_jitter_ms": percentiles(stopwatch_lateness),
+        "wakeups_per_minute": counting.wakeups / wall * 60,
+        "cpu_seconds_per_hour": cpu / wall * 3600,
+        # Eventos del host pendientes y trabajos del planificador al atender cada despertar
+        "event_queue_depth": depth_stats(counting.host_depths),
+        "scheduled_jobs": depth_stats(counting.job_depths),
+    }
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Benchmark de los relojes")
+    parser.add_argument("--durations", type=float, nargs="+", default=[5, 15, 60],
+                        help="duraciones de las cuentas regresivas en segundos")
+    parser.add_argument("--stopwatch", choices=STOPWATCH_SCALES, default="tenths",
+                        help="modo del display del cronómetro (más fino que décimas: un tick por cuadro)")
+    parser.add_argument("--minimized", action="store_true", help="ticks de la aplicación minimizada al tray")
+    parser.add_argument("--program", help="programa de config.INTERVAL_PROGRAMS (reemplaza --durations)")
+    parser.add_argument("--tk", action="store_true", help="usar el bucle real de Tk (requiere display)")
+    parser.add_argument("--output", help="archivo JSON de salida (por defecto stdout)")
+    args = parser.parse_args()
+
+    host = TkHost() if args.tk else LoopHost()
+    runs = []
+    if args.program:
+        programs = compile_programs(config.INTERVAL_PROGRAMS)
+        if args.program not in programs:
+            parser.error(f"programa desconocido: {args.program}")
+        print(f"🔁 Programa {args.program}...", file=sys.stderr)
+        runs.append(run_countdown(host, None, programs[args.program], args.stopwatch, args.minimized))
+    for duration in [] if args.program else args.durations:
+        print(f"⏱️  Cuenta regresiva de {duration:g} s...", file=sys.stderr)
+        runs.append(run_countdown(host, duration, None, args.stopwatch, args.minimized))
+
+    report = {
+        "app_version": config.APP_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "host": "tk" if args.tk else "loop",
+        "runs": runs,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"✅ Resultados guardados en {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -80,31 +80,10 @@ def create_default_icon():
     print("🎨 Creando icono por defecto...")
     
     try:
-        from PIL import Image, ImageDraw
+        # El dibujo se comparte con el icono de la aplicación (tray_icons.py)
+        from tray_icons import save_app_icon
         
-        # Crear una imagen 256x256 con fondo transparente
-        img = Image.new('RGBA', (256, 256), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
-        # Dibujar un círculo azul (representando un cronómetro)
-        center = (128, 128)
-        radius = 100
-        draw.ellipse([center[0]-radius, center[1]-radius, center[0]+radius, center[1]+radius], 
-                    fill=(70, 130, 180, 255), outline=(0, 0, 139, 255), width=3)
-        
-        # Dibujar manecillas del reloj
-        # Manecilla de segundos (roja)
-        draw.line([center, (center[0], center[1]-80)], fill=(255, 0, 0, 255), width=3)
-        # Manecilla de minutos (azul)
-        draw.line([center, (center[0]+40, center[1])], fill=(0, 0, 139, 255), width=4)
-        # Manecilla de horas (negro)
-        draw.line([center, (center[0], center[1]+30)], fill=(0, 0, 0, 255), width=5)
-        
-        # Punto central
-        draw.ellipse([center[0]-5, center[1]-5, center[0]+5, center[1]+5], fill=(0, 0, 0, 255))
-        
-        # Guardar como ICO
-        img.save('icon.ico', format='ICO', sizes=[(256, 256), (128, 128), (64, 64), (32, 32), (16, 16)])
+        save_app_icon('icon.ico')
         print("✅ Icono por defecto creado: icon.ico")
         return True
         
@@ -0,0 +1,134 @@
+"""
+Display de reloj sobre un canvas con glifos prerenderizados
+
+Cada carácter ocupa una celda fija con su propio ítem del canvas; al cambiar el
+texto solo se reconfiguran las celdas cuyo carácter cambió, sin volver a
+maquetar toda la cadena como hace un label. Los glifos se dibujan una sola vez
+por tamaño y color con PIL; sin una fuente TrueType se usan ítems de texto.
+"""
+
+import functools
+import tkinter as tk
+from tkinter import font as tkfont
+
+CHARS = "0123456789:.- "
+# Fuentes monoespaciadas probadas en orden (PIL también busca en la carpeta de fuentes de Windows)
+FONT_FILES = ("consolab.ttf", "consola.ttf", "DejaVuSansMono-Bold.ttf", "DejaVuSansMono.ttf", "Menlo.ttc")
+# Fuente de los ítems de texto cuando no hay glifos
+FALLBACK_FAMILY = "Consolas"
+
+@functools.lru_cache(maxsize=None)
+def truetype(size):
+    """Primera fuente de FONT_FILES disponible en `size` píxeles, o None"""
+    from PIL import ImageFont
+    for name in FONT_FILES:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return None
+
+@functools.lru_cache(maxsize=None)
+def glyph_images(size, color):
+    """Imágenes RGBA de igual tamaño para cada carácter de CHARS, o None"""
+    font = truetype(size)
+    if font is None:
+        return None
+    from PIL import Image, ImageDraw
+
+    ascent, descent = font.getmetrics()
+    width = int(max(font.getlength(ch) for ch in CHARS)) + 1
+    images = {}
+    for ch in CHARS:
+        image = Image.new("RGBA", (width, ascent + descent), (0, 0, 0, 0))
+        ImageDraw.Draw(image).text(((width - font.getlength(ch)) / 2, 0), ch, font=font, fill=color)
+        images[ch] = image
+    return images
+
+@functools.lru_cache(maxsize=None)
+def glyph_photos(size, color):
+    """Glifos como PhotoImage de Tk (requiere la ventana raíz), o None"""
+    images = glyph_images(size, color)
+    if images is None:
+        return None
+    from PIL import ImageTk
+    return {ch: ImageTk.PhotoImage(image) for ch, image in images.items()}
+
+class GlyphClock(tk.Canvas):
+    """Reloj de celdas fijas; misma interfaz show()/show_key() que CachedLabel"""
+
+    def __init__(self, master, size=28, color="white", bg="black", text="00:00:00.00",
+                 probe=None, name="clock", **kwargs):
+        super().__init__(master, bg=bg, highlightthickness=0, borderwidth=0, **kwargs)
+        self.probe = probe        # instrumentación opcional (cuenta las celdas redibujadas)
+        self.name = name
+        self.size = size
+        self.color = None
+        self.text = ""
+        self.key = None
+        self._items = []
+        self._photos = None
+        self._font = None
+        self._set_color(color)
+        self.show(text)
+
+    def _set_color(self, color):
+        self.color = color
+        self._photos = glyph_photos(self.size, color)
+        if self._photos is None:
+            if self._font is None:
+                self._font = tkfont.Font(family=FALLBACK_FAMILY, size=-self.size, weight="bold")
+            self.cell = (self._font.measure("0"), self._font.metrics("linespace"))
+        else:
+            sample = self._photos["0"]
+            self.cell = (sample.width(), sample.height())
+
+    def _resize(self, cells):
+        """Crea o quita celdas para `cells` caracteres"""
+        width, height = self.cell
+        while len(self._items) > cells:
+            self.delete(self._items.pop())
+        while len(self._items) < cells:
+            x = len(self._items) * width
+            if self._photos is None:
+                item = self.create_text(x, 0, anchor="nw", text="", font=self._font, fill=self.color)
+            else:
+                item = self.create_image(x, 0, anchor="nw")
+            self._items.append(item)
+        self.configure(width=cells * width, height=height)
+
+    def _draw(self, index, ch):
+        if self._photos is None:
+            self.itemconfigure(self._items[index], text=ch, fill=self.color)
+        else:
+            self.itemconfigure(self._items[index], image=self._photos.get(ch, self._photos[" "]))
+
+    def show(self, text, color=None, key=None):
+        """Muestra `text`; solo se redibujan las celdas que cambiaron"""
+        self.key = key
+        if color is not None and color != self.color:
+            self._set_color(color)
+            previous = ""                 # con otro color se redibuja todo
+        else:
+            previous = self.text
+        if text == previous:
+            return
+
+        calls = 0
+        if len(text) != len(self._items):
+            self._resize(len(text))
+            previous = ""
+            calls += 1
+        for index, ch in enumerate(text):
+            if index >= len(previous) or previous[index] != ch:
+                self._draw(index, ch)
+                calls += 1
+        self.text = text
+        if self.probe is not None and self.probe.enabled:
+            self.probe.rendered(self.name, calls)
+
+    def show_key(self, key, formatter, color=None):
+        """Como show(), pero solo formatea el texto si cambió `key`"""
+        if key == self.key and (color is None or color == self.color):
+            return
+        self.show(formatter(key), color, key)
@@ -13,6 +13,24 @@ WINDOW_WIDTH = 500
 WINDOW_HEIGHT = 250
 WINDOW_RESIZABLE = False
 
+# Presupuesto de arranque: milisegundos hasta el primer cuadro
+STARTUP_BUDGET_MS = 400
+
+# API local de control (loopback; puerto y token en control.json)
+CONTROL_API_ENABLED = True
+
+# En el tray se destruye la ventana y se reconstruye al mostrarla (menos memoria,
+# restauración algo más lenta); ver benchmark_memory.py
+TRAY_LOW_MEMORY = False
+
+# Display del cronómetro como reloj de glifos sobre canvas (canvas_clock.py); la
+# vista de presentación (F11) lo usa siempre
+CANVAS_CLOCK = False
+# Resolución inicial del cronómetro: "tenths", "centiseconds" o "milliseconds"
+# (más fina que una décima se redibuja a CLOCK_FPS cuadros por segundo)
+STOPWATCH_DISPLAY = "tenths"
+CLOCK_FPS = 60
+
 # Configuración de colores
 COLORS = {
     'primary': '#1f538d',
@@ -34,6 +52,14 @@ TIMER_PRESETS = [
     ("1 hora", 60)
 ]
 
+# Programas de intervalos: (nombre, [(fase, segundos), ...], repeticiones del ciclo)
+INTERVAL_PROGRAMS = [
+    ("Pomodoro", [("Trabajo", 25 * 60), ("Descanso", 5 * 60)] * 3
+        + [("Trabajo", 25 * 60), ("Descanso largo", 15 * 60)], 1),
+    ("HIIT 20/10", [("Ejercicio", 20), ("Descanso", 10)], 8),
+    ("Trabajo 50/10", [("Trabajo", 50 * 60), ("Descanso", 10 * 60)], 4),
+]
+
 # Configuración del system tray
 TRAY_ICON_SIZE = 16
 TRAY_ICON_COLOR = (0, 120, 255, 255)  # Azul con transparencia
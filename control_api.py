@@ -0,0 +1,182 @@
+"""
+API local de control: comandos JSON por lotes sobre loopback, atendidos con asyncio
+
+Protocolo (una línea JSON por mensaje, en ambos sentidos):
+    -> {"token": "..."}                                      primera línea
+    <- {"ok": true}
+    -> {"cmd": "timer.start", "seconds": 1500}               un comando
+    -> {"cmd": "timer.program", "name": "Pomodoro"}         (config.INTERVAL_PROGRAMS)
+    -> [{"cmd": "stopwatch.lap"}, {"cmd": "query"}]          o un lote
+    <- {"results": [{"ok": true}, {"ok": true, "state": {...}}]}
+
+El puerto y el token se publican en control.json, junto al diario de estado.
+El bucle de asyncio corre en su propio hilo: las consultas se responden desde
+el último estado publicado y los comandos se entregan a la aplicación por lotes.
+"""
+
+import asyncio
+import json
+import os
+import secrets
+import threading
+import time
+
+from state_journal import default_state_path
+
+HOST = "127.0.0.1"
+# Comandos que cambian el estado (se ejecutan en el hilo de la interfaz)
+ACTIONS = frozenset((
+    "timer.start", "timer.program", "timer.pause", "timer.reset",
+    "stopwatch.start", "stopwatch.pause", "stopwatch.reset", "stopwatch.lap",
+    "show",
+))
+# Comandos de solo lectura (se responden en el hilo de asyncio)
+QUERIES = frozenset(("query",))
+# Comandos por lote como máximo
+MAX_BATCH = 1000
+
+def default_control_path():
+    """Archivo con el puerto y el token, junto al diario de estado"""
+    return os.path.join(os.path.dirname(default_state_path()), "control.json")
+
+def live_state(published):
+    """Estado publicado llevado al instante actual"""
+    if published is None:
+        return None
+    state = dict(published)
+    lag = time.monotonic() - state.pop("at")
+    timer = state.get("timer")
+    if timer and timer["state"] == "running":
+        state["timer"] = dict(timer, remaining=max(0.0, timer["remaining"] - lag))
+    stopwatch = state.get("stopwatch")
+    if stopwatch and stopwatch["state"] == "running":
+        state["stopwatch"] = dict(stopwatch, elapsed=stopwatch["elapsed"] + lag)
+    return state
+
+def error(message):
+    return {"ok": False, "error": message}
+
+class ControlServer:
+    """Servidor asyncio en un hilo propio; `execute(batch, done)` corre los comandos"""
+
+    def __init__(self, execute, path=None, host=HOST, port=0):
+        self.execute = execute
+        self.path = path or default_control_path()
+        self.host = host
+        self.port = port
+        self.token = secrets.token_hex(16)
+        self._published = None
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    def publish(self, state):
+        """Reemplaza el estado que ven las consultas (`state` incluye "at" monotónico)"""
+        self._published = state
+
+    def start(self):
+        """Arranca el hilo del servidor; devuelve cuando ya acepta conexiones"""
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="control-api", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self._server is not None
+
+    def _run(self, ready):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port)
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+            self._write_endpoint()
+        except OSError:
+            self._server = None
+            ready.set()
+            self._loop.close()
+            return
+        ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+    def _write_endpoint(self):
+        """Publica puerto y token en un archivo legible solo por el usuario"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + ".tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"host": self.host, "port": self.port, "token": self.token, "pid": os.getpid()}, f)
+        os.replace(temp_path, self.path)
+
+    def stop(self):
+        """Detiene el servidor y retira el archivo del endpoint"""
+        if self._loop is not None and self._server is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    async def _handle(self, reader, writer):
+        try:
+            hello = json.loads(await reader.readline() or b"null")
+            if not isinstance(hello, dict) or not secrets.compare_digest(str(hello.get("token")), self.token):
+                writer.write(b'{"ok": false, "error": "token"}\n')
+                return
+            writer.write(b'{"ok": true}\n')
+
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply = await self._reply(line)
+                writer.write(json.dumps(reply, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    async def _reply(self, line):
+        """Respuesta a una línea (comando o lote)"""
+        try:
+            batch = json.loads(line)
+        except ValueError:
+            return {"results": [error("JSON no válido")]}
+        if isinstance(batch, dict):
+            batch = [batch]
+        if not isinstance(batch, list) or len(batch) > MAX_BATCH:
+            return {"results": [error(f"se espera un comando o un lote de hasta {MAX_BATCH}")]}
+
+        results = [None] * len(batch)
+        pending = []
+        for i, command in enumerate(batch):
+            name = command.get("cmd") if isinstance(command, dict) else None
+            if name not in ACTIONS and name not in QUERIES:
+                results[i] = error(f"comando desconocido: {name!r}")
+            else:
+                pending.append(i)
+
+        if all(batch[i]["cmd"] in QUERIES for i in pending):
+            # Solo lectura: no hace falta pasar por el hilo de la interfaz
+            state = live_state(self._published)
+            for i in pending:
+                results[i] = {"ok": True, "state": state}
+        else:
+            # Con acciones, el lote entero se ejecuta en orden en la interfaz
+            loop = asyncio.get_event_loop()
+            future = loop.create_future()
+            done = lambda values: loop.call_soon_threadsafe(_resolve, future, values)
+            self.execute([batch[i] for i in pending], done)
+            for i, value in zip(pending, await future):
+                results[i] = value
+        return {"results": results}
+
+def _resolve(future, values):
+    if not future.done():
+        future.set_result(values)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Cliente de la API local de control del Temporizador & Cronómetro
+
+Uso:
+    python control_client.py query
+    python control_client.py timer.start=1500 stopwatch.start     # un solo lote
+    python control_client.py --load 5 --batch 10                   # prueba de carga
+"""
+
+import argparse
+import json
+import socket
+import sys
+import time
+
+from control_api import default_control_path
+
+class ControlClient:
+    """Conexión persistente a la API de control"""
+
+    def __init__(self, path=None, timeout=5.0):
+        with open(path or default_control_path(), encoding="utf-8") as f:
+            endpoint = json.load(f)
+        self.sock = socket.create_connection((endpoint["host"], endpoint["port"]), timeout=timeout)
+        self.file = self.sock.makefile("rb")
+        self.sock.sendall(json.dumps({"token": endpoint["token"]}).encode("utf-8") + b"\n")
+        if not json.loads(self.file.readline()).get("ok"):
+            raise PermissionError("token rechazado")
+
+    def send(self, batch):
+        """Envía un comando o un lote y devuelve la lista de resultados"""
+        self.sock.sendall(json.dumps(batch).encode("utf-8") + b"\n")
+        return json.loads(self.file.readline())["results"]
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+def parse_command(text):
+    """"timer.start=1500" -> {"cmd": "timer.start", "seconds": 1500.0}; "timer.program=Pomodoro" -> {"name": ...}"""
+    name, _, value = text.partition("=")
+    command = {"cmd": name}
+    if value:
+        try:
+            command["seconds"] = float(value)
+        except ValueError:
+            command["name"] = value
+    return command
+
+def load_test(client, seconds, batch_size):
+    """Lotes de consultas y vueltas tan rápido como sea posible durante `seconds`"""
+    client.send({"cmd": "stopwatch.start"})
+    batch = [{"cmd": "query"}] * (batch_size - 1) + [{"cmd": "stopwatch.lap"}]
+    latencies = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        client.send(batch)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return {
+        "batches": len(latencies),
+        "commands_per_second": round(len(latencies) * batch_size / seconds),
+        "latency_ms": {
+            "p50": round(latencies[len(latencies) // 2], 3),
+            "p99": round(latencies[int(len(latencies) * 0.99)], 3),
+            "max": round(latencies[-1], 3),
+        },
+    }
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Cliente de la API de control")
+    parser.add_argument("commands", nargs="*", help='comandos del lote, p. ej. "query" o "timer.start=1500"')
+    parser.add_argument("--load", type=float, metavar="SEGUNDOS", help="prueba de carga")
+    parser.add_argument("--batch", type=int, default=1, help="comandos por lote en la prueba de carga")
+    args = parser.parse_args()
+
+    try:
+        client = ControlClient()
+    except (OSError, ValueError) as e:
+        print(f"❌ No se pudo conectar con la aplicación: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        if args.load:
+            result = load_test(client, args.load, max(1, args.batch))
+        else:
+            result = client.send([parse_command(c) for c in args.commands or ["query"]])
+    finally:
+        client.close()
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
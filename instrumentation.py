@@ -0,0 +1,123 @@
+"""
+Instrumentación de las rutas calientes: tiempos de callbacks, retraso de after y renders
+
+Los trabajos del planificador se registran como "job:<nombre>", aparte de los
+métodos envueltos con instrument(), para que un método que es ambas cosas no
+se cuente dos veces. Los renders son las llamadas reales a configure de los
+widgets (las que CachedLabel o GlyphClock no pudieron evitar).
+"""
+
+import functools
+import json
+import threading
+import time
+
+class Stat:
+    """Contador con total y máximo (en milisegundos)"""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max, 3),
+        }
+
+class Instrumentation:
+    """Registro de mediciones; desactivado cuesta una comprobación de atributo"""
+
+    def __init__(self, enabled=False, clock=time.perf_counter):
+        self.enabled = enabled
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        """Descarta todas las mediciones"""
+        self.callbacks = {}       # nombre -> Stat del tiempo de ejecución
+        self.after_delay = Stat() # retraso entre el instante programado y la ejecución
+        self.renders = {}         # nombre del widget -> llamadas a configure
+        self.started = self.clock()
+
+    def _stat(self, name):
+        stat = self.callbacks.get(name)
+        if stat is None:
+            stat = self.callbacks[name] = Stat()
+        return stat
+
+    def wrap(self, name, function):
+        """Devuelve `function` envuelta para medir su tiempo de ejecución"""
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return function(*args, **kwargs)
+            start = self.clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self._stat(name).add((self.clock() - start) * 1000)
+        return wrapper
+
+    def instrument(self, obj, *names):
+        """Reemplaza métodos de una instancia por versiones medidas"""
+        for name in names:
+            setattr(obj, name, self.wrap(name, getattr(obj, name)))
+
+    def run_scheduled(self, callback, lateness):
+        """Ejecuta un trabajo del planificador registrando su retraso y duración"""
+        self.after_delay.add(lateness * 1000)
+        name = "job:" + getattr(callback, "__name__", repr(callback))
+        start = self.clock()
+        try:
+            callback()
+        finally:
+            self._stat(name).add((self.clock() - start) * 1000)
+
+    def rendered(self, name, calls=1):
+        """Registra `calls` reconfiguraciones reales del widget `name`"""
+        self.renders[name] = self.renders.get(name, 0) + calls
+
+    def snapshot(self):
+        """Estado actual de las mediciones como diccionario serializable"""
+        uptime = self.clock() - self.started
+        return {
+            "enabled": self.enabled,
+            "uptime_s": round(uptime, 3),
+            "threads": threading.active_count(),
+            "after_delay_ms": self.after_delay.as_dict(),
+            "callbacks": {name: stat.as_dict() for name, stat in sorted(self.callbacks.items())},
+            "renders": dict(sorted(self.renders.items())),
+            "renders_per_second": {
+                name: round(count / uptime, 2) if uptime > 0 else 0.0
+                for name, count in sorted(self.renders.items())
+            },
+        }
+
+    def dump(self, path):
+        """Guarda el snapshot como JSON"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+            f.write("\n")
+
+    def summary(self, limit=6):
+        """Texto compacto para el overlay"""
+        lines = [
+            f"hilos {threading.active_count()}  "
+            f"after +{self.after_delay.as_dict()['mean_ms']:.1f}/{self.after_delay.max:.1f} ms"
+        ]
+        busiest = sorted(self.callbacks.items(), key=lambda item: item[1].total, reverse=True)
+        for name, stat in busiest[:limit]:
+            mean = stat.total / stat.count if stat.count else 0.0
+            lines.append(f"{name[:22]:<22} {stat.count:>6} {mean:6.2f} ms")
+        return "\n".join(lines)
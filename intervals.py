@@ -0,0 +1,51 @@
+"""
+Programas de intervalos (Pomodoro, HIIT, ciclos de trabajo y descanso)
+
+Un programa se compila una sola vez a los desplazamientos acumulados en que
+termina cada fase de un ciclo. La fase vigente en cualquier instante sale de
+una división por la duración del ciclo y una búsqueda binaria: no se recorren
+las fases ni se programa un despertar o un hilo por cada una.
+"""
+
+import bisect
+import itertools
+from array import array
+
+class IntervalProgram:
+    """Fases (nombre, segundos) repetidas `repeat` veces, compiladas a una línea de tiempo"""
+
+    def __init__(self, name, steps, repeat=1):
+        steps = list(steps)
+        if not steps or repeat < 1:
+            raise ValueError("el programa no tiene fases")
+        if any(seconds <= 0 for _, seconds in steps):
+            raise ValueError("cada fase debe durar más de cero segundos")
+
+        self.name = name
+        self.names = tuple(phase for phase, _ in steps)
+        # Fin de cada fase medido desde el inicio del ciclo
+        self.ends = array('d', itertools.accumulate(float(seconds) for _, seconds in steps))
+        self.cycle = self.ends[-1]
+        self.repeat = repeat
+        self.total = self.cycle * repeat
+
+    def __len__(self):
+        """Cantidad total de fases (todas las repeticiones)"""
+        return len(self.names) * self.repeat
+
+    def phase_name(self, index):
+        """Nombre de la fase número `index` del programa completo"""
+        return self.names[index % len(self.names)]
+
+    def locate(self, elapsed):
+        """Fase en `elapsed` segundos: (índice, nombre, segundos que le quedan)"""
+        if elapsed >= self.total:
+            return len(self) - 1, self.names[-1], 0.0
+        cycle, offset = divmod(max(0.0, elapsed), self.cycle)
+        # Un fin de fase exacto ya pertenece a la fase siguiente
+        index = bisect.bisect_right(self.ends, offset)
+        return int(cycle) * len(self.names) + index, self.names[index], self.ends[index] - offset
+
+def compile_programs(specs):
+    """Programas por nombre a partir de entradas (nombre, fases, repeticiones)"""
+    return {name: IntervalProgram(name, steps, repeat) for name, steps, repeat in specs}
@@ -0,0 +1,79 @@
+"""
+Exportación continua de vueltas y sesiones a CSV o JSONL (solo se agrega al final)
+"""
+
+import csv
+import io
+import json
+import os
+from datetime import datetime
+
+# Filas en memoria antes de forzar una escritura
+FLUSH_ROWS = 256
+# Segundos máximos que una fila puede esperar en memoria
+FLUSH_INTERVAL = 2.0
+
+FIELDS = ("event", "session", "lap", "cumulative", "split", "timestamp")
+
+class LapExporter:
+    """Escribe eventos del cronómetro en lotes a un archivo que solo crece"""
+
+    def __init__(self, path, max_rows=FLUSH_ROWS):
+        self.path = path
+        self.format = "jsonl" if path.lower().endswith((".jsonl", ".json")) else "csv"
+        self.max_rows = max_rows
+        self.session = datetime.now().isoformat(timespec="seconds")
+        self._buffer = []
+
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        newline = "" if self.format == "csv" else None
+        self._file = open(path, "a", encoding="utf-8", newline=newline)
+        if self.format == "csv" and is_new:
+            self._buffer.append(self._csv_line(FIELDS))
+
+    @property
+    def pending(self):
+        """Cantidad de filas todavía sin escribir"""
+        return len(self._buffer)
+
+    def write_event(self, event, lap=None, cumulative=None, split=None):
+        """Agrega un evento al buffer; escribe el lote si está lleno"""
+        row = (
+            event,
+            self.session,
+            lap,
+            None if cumulative is None else round(cumulative, 3),
+            None if split is None else round(split, 3),
+            datetime.now().isoformat(timespec="milliseconds"),
+        )
+        if self.format == "csv":
+            self._buffer.append(self._csv_line(row))
+        else:
+            record = {key: value for key, value in zip(FIELDS, row) if value is not None}
+            self._buffer.append(json.dumps(record, ensure_ascii=False) + "\n")
+
+        if len(self._buffer) >= self.max_rows:
+            self.flush()
+
+    def flush(self):
+        """Escribe el lote pendiente con una sola llamada y lo manda al disco"""
+        if not self._buffer or self._file is None:
+            return
+        self._file.write("".join(self._buffer))
+        self._buffer.clear()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        """Escribe lo pendiente y cierra el archivo"""
+        if self._file is None:
+            return
+        self.flush()
+        self._file.close()
+        self._file = None
+
+    @staticmethod
+    def _csv_line(values):
+        out = io.StringIO()
+        csv.writer(out).writerow(["" if value is None else value for value in values])
+        return out.getvalue()
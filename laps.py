@@ -0,0 +1,63 @@
+"""
+Almacenamiento compacto de vueltas con estadísticas incrementales de parciales
+"""
+
+import math
+from array import array
+
+class LapStore:
+    """Tiempos acumulados y parciales en array('d'); estadísticas en O(1) por vuelta"""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Elimina todas las vueltas y reinicia las estadísticas"""
+        self.cumulative = array('d')
+        self.splits = array('d')
+        self.best_index = None
+        self.worst_index = None
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def __len__(self):
+        return len(self.cumulative)
+
+    def add(self, cumulative):
+        """Registra una vuelta por su tiempo acumulado y devuelve el parcial"""
+        previous = self.cumulative[-1] if self.cumulative else 0.0
+        split = cumulative - previous
+        self.cumulative.append(cumulative)
+        self.splits.append(split)
+        index = len(self.splits) - 1
+
+        if self.best_index is None or split < self.splits[self.best_index]:
+            self.best_index = index
+        if self.worst_index is None or split > self.splits[self.worst_index]:
+            self.worst_index = index
+
+        # Algoritmo de Welford: media y varianza sin volver a recorrer la lista
+        delta = split - self._mean
+        self._mean += delta / len(self.splits)
+        self._m2 += delta * (split - self._mean)
+        return split
+
+    @property
+    def best(self):
+        return self.splits[self.best_index] if self.best_index is not None else None
+
+    @property
+    def worst(self):
+        return self.splits[self.worst_index] if self.worst_index is not None else None
+
+    @property
+    def mean(self):
+        return self._mean if self.splits else None
+
+    @property
+    def stddev(self):
+        """Desviación estándar muestral de los parciales"""
+        count = len(self.splits)
+        if count < 2:
+            return 0.0 if count else None
+        return math.sqrt(self._m2 / (count - 1))
@@ -0,0 +1,96 @@
+"""
+Cuentas regresivas múltiples con nombre, ordenadas en un heap por fecha límite
+"""
+
+import heapq
+import itertools
+import math
+import time
+
+class MultiTimerQueue:
+    """Cola de temporizadores con nombre; solo el vencimiento más próximo importa"""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._heap = []           # entradas [fecha_límite, id, nombre, duración, activo]
+        self._entries = {}        # nombre -> entrada activa
+        self._ids = itertools.count()
+        self._stale = 0           # entradas canceladas que siguen en el heap
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def add(self, name, seconds):
+        """Agrega (o reemplaza) un temporizador que vence en `seconds` segundos"""
+        if not math.isfinite(seconds):
+            raise ValueError("la duración debe ser finita")
+        if name in self._entries:
+            self.cancel(name)
+        entry = [self.clock() + seconds, next(self._ids), name, seconds, True]
+        self._entries[name] = entry
+        heapq.heappush(self._heap, entry)
+        return entry[0]
+
+    def cancel(self, name):
+        """Cancela un temporizador; la entrada se descarta del heap más tarde"""
+        entry = self._entries.pop(name, None)
+        if entry is None:
+            return False
+        entry[4] = False
+        self._stale += 1
+
+        # Compactar si el heap está lleno de entradas canceladas
+        if self._stale > 64 and self._stale > len(self._heap) // 2:
+            self._heap = [e for e in self._heap if e[4]]
+            heapq.heapify(self._heap)
+            self._stale = 0
+        return True
+
+    def clear(self):
+        """Elimina todos los temporizadores"""
+        self._heap = []
+        self._entries = {}
+        self._stale = 0
+
+    def _drop_stale_head(self):
+        while self._heap and not self._heap[0][4]:
+            heapq.heappop(self._heap)
+            self._stale -= 1
+
+    def next_deadline(self):
+        """Fecha límite monotónica más próxima, o None si no hay temporizadores"""
+        self._drop_stale_head()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_expired(self, now=None):
+        """Quita y devuelve los nombres de los temporizadores ya vencidos"""
+        if now is None:
+            now = self.clock()
+        expired = []
+        self._drop_stale_head()
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            del self._entries[entry[2]]
+            expired.append(entry[2])
+            self._drop_stale_head()
+        return expired
+
+    def nearest(self, count):
+        """Los `count` temporizadores más próximos como (nombre, restante), en O(k log k)"""
+        now = self.clock()
+        result = []
+        heap = self._heap
+        frontier = [(heap[0], 0)] if heap else []
+
+        # Recorre el heap desde la raíz sin tocar el resto de los nodos
+        while frontier and len(result) < count:
+            entry, index = heapq.heappop(frontier)
+            if entry[4]:
+                result.append((entry[2], max(0.0, entry[0] - now)))
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        return result
@@ -0,0 +1,34 @@
+"""
+Avisos de fin de tiempo que no bloquean el bucle principal
+
+Los vencimientos que llegan juntos (varios temporizadores en el mismo segundo)
+se agrupan en un único aviso.
+"""
+
+# Ventana (segundos) en la que los vencimientos se agrupan en un solo aviso
+COALESCE_WINDOW = 0.25
+
+class Notifier:
+    """Agrupa avisos y los entrega a `show(items)` mediante el planificador"""
+
+    def __init__(self, scheduler, show, window=COALESCE_WINDOW):
+        self.scheduler = scheduler
+        self.show = show
+        self.window = window
+        self.pending = []
+        self._job = None
+
+    def notify(self, item):
+        """Agrega un aviso; se muestra al cerrar la ventana de agrupación"""
+        if item not in self.pending:
+            self.pending.append(item)
+        if self._job is None:
+            self._job = self.scheduler.call_later(self.window, self.flush)
+
+    def flush(self):
+        """Entrega ya los avisos pendientes"""
+        self.scheduler.cancel(self._job)
+        self._job = None
+        items, self.pending = self.pending, []
+        if items:
+            self.show(items)
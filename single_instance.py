@@ -0,0 +1,219 @@
+"""
+Instancia única: la segunda ejecución reenvía sus argumentos a la primera y sale
+
+Solo usa la biblioteca estándar para que reenviar no cargue Tk. El "candado" es
+un endpoint propio del usuario: un socket Unix en una carpeta privada (0700) o,
+en Windows, una tubería con nombre creada como primera instancia. Quien logra
+crearlo es la instancia principal y atiende los comandos en un hilo. Los dos
+extremos se autentican con una clave guardada en un archivo legible solo por el
+usuario: otro usuario que ocupe el endpoint no recibe los comandos (la segunda
+ejecución arranca por su cuenta) ni puede inyectarlos.
+"""
+
+import argparse
+import getpass
+import json
+import os
+import re
+import secrets
+import socket
+import sys
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+from state_journal import default_state_path
+
+# Bytes de la clave compartida por las instancias del usuario
+KEY_BYTES = 32
+# Espera máxima de la segunda instancia antes de arrancar por su cuenta
+FORWARD_TIMEOUT = 1.0
+# Tamaño máximo de un comando reenviado
+MAX_MESSAGE = 4096
+
+_DURATION_UNITS = {"h": 3600, "m": 60, "s": 1}
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)([hms])")
+
+def parse_duration(text):
+    """Segundos a partir de "25m", "1h30m", "90s", "1:30:00" o "25" (minutos)"""
+    text = text.strip().lower()
+    try:
+        if ":" in text:
+            seconds = 0
+            for part in text.split(":"):
+                seconds = seconds * 60 + int(part)
+            return seconds
+        if re.fullmatch(r"\d+(?:\.\d+)?", text):
+            return round(float(text) * 60)
+        if _DURATION_RE.sub("", text) == "" and text:
+            return round(sum(float(n) * _DURATION_UNITS[u] for n, u in _DURATION_RE.findall(text)))
+    except ValueError:
+        pass
+    raise argparse.ArgumentTypeError(f"duración no válida: {text!r}")
+
+def parse_args(argv):
+    """Argumentos de línea de comandos de la aplicación"""
+    parser = argparse.ArgumentParser(description="Temporizador & Cronómetro")
+    parser.add_argument("--start", type=parse_duration, metavar="DURACIÓN",
+                        help='inicia el temporizador (p. ej. "25m", "1h30m", "90s", "25")')
+    parser.add_argument("--show", action="store_true", help="muestra la ventana")
+    return parser.parse_args(argv)
+
+def launch_command(args):
+    """Comando a ejecutar por la instancia principal para estos argumentos"""
+    # Sin argumentos (doble clic en el acceso directo) se trae la ventana al frente
+    return {"start": args.start, "show": args.show or args.start is None}
+
+def private_dir():
+    """Carpeta solo del usuario: XDG_RUNTIME_DIR o la del diario de estado"""
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    if base and os.path.isdir(base):
+        return base
+    path = os.path.dirname(default_state_path())
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    return path
+
+def default_endpoint():
+    """(dirección, familia) del endpoint por usuario"""
+    if sys.platform.startswith("win"):
+        try:
+            user = getpass.getuser()
+        except Exception:
+            user = ""
+        return r"\\.\pipe\temporizador-" + re.sub(r"[^\w.-]", "_", user), "AF_PIPE"
+    return os.path.join(private_dir(), "temporizador.sock"), "AF_UNIX"
+
+def default_key_path():
+    """Archivo de la clave, junto al diario de estado"""
+    return os.path.join(os.path.dirname(default_state_path()), "instance.key")
+
+def load_key(path=None):
+    """Clave compartida por las instancias del usuario; se crea la primera vez (modo 0600)"""
+    path = path or default_key_path()
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    for _ in range(20):
+        try:
+            with open(path, "rb") as f:
+                key = f.read()
+            if len(key) >= KEY_BYTES:
+                return key
+        except FileNotFoundError:
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            except FileExistsError:
+                continue
+            key = secrets.token_bytes(KEY_BYTES)
+            with os.fdopen(fd, "wb") as f:
+                f.write(key)
+            return key
+        # Otra instancia la está escribiendo en este momento
+        time.sleep(0.05)
+    raise OSError(f"clave no válida en {path}")
+
+class Instance:
+    """Resultado de reclamar la instancia; `listener` es None si no hay IPC"""
+
+    def __init__(self, args, listener=None):
+        self.args = args
+        self.listener = listener
+
+    def serve(self, on_command):
+        """Atiende comandos en un hilo; `on_command` se llama desde ese hilo"""
+        if self.listener is None:
+            return
+        thread = threading.Thread(target=self._accept_loop, args=(self.listener, on_command),
+                                  name="single-instance", daemon=True)
+        thread.start()
+
+    def _accept_loop(self, listener, on_command):
+        while True:
+            try:
+                # accept() ya verificó la clave en ambos sentidos
+                conn = listener.accept()
+            except (OSError, EOFError, AuthenticationError):
+                if self.listener is None:
+                    return
+                continue
+            with conn:
+                try:
+                    if not conn.poll(FORWARD_TIMEOUT):
+                        continue
+                    command = json.loads(conn.recv_bytes(MAX_MESSAGE))
+                    if not isinstance(command, dict):
+                        continue
+                    on_command(command)
+                    conn.send_bytes(b'{"ok": true}')
+                except (OSError, EOFError, ValueError):
+                    continue
+
+    def close(self):
+        listener, self.listener = self.listener, None
+        if listener is not None:
+            listener.close()
+
+def _stale(path):
+    """True si el socket Unix quedó de una instancia que ya no existe"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except ConnectionRefusedError:
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+    return False
+
+def _listen(endpoint, key):
+    """Endpoint en escucha, o None si ya lo tiene otro proceso"""
+    address, family = endpoint
+    for attempt in range(2):
+        try:
+            return Listener(address, family, backlog=8, authkey=key)
+        except OSError:
+            # Un socket huérfano tras un cierre forzado no debe bloquear el arranque
+            if family != "AF_UNIX" or attempt or not _stale(address):
+                return None
+            try:
+                os.unlink(address)
+            except OSError:
+                return None
+    return None
+
+def forward(command, endpoint, key):
+    """Envía `command` a la instancia principal; True si la confirmó"""
+    replies = []
+
+    def send():
+        try:
+            with Client(*endpoint, authkey=key) as conn:
+                conn.send_bytes(json.dumps(command).encode("utf-8"))
+                if conn.poll(FORWARD_TIMEOUT):
+                    replies.append(json.loads(conn.recv_bytes(MAX_MESSAGE)))
+        except (OSError, EOFError, ValueError, AuthenticationError):
+            pass
+
+    # El saludo de autenticación no tiene timeout propio: se espera en un hilo
+    thread = threading.Thread(target=send, name="single-instance-forward", daemon=True)
+    thread.start()
+    thread.join(2 * FORWARD_TIMEOUT)
+    return bool(replies) and isinstance(replies[0], dict) and replies[0].get("ok") is True
+
+def claim_instance(argv, endpoint=None, key=None):
+    """Reclama la instancia única o, si ya hay una, le reenvía `argv` y sale"""
+    args = parse_args(argv)
+    try:
+        endpoint = endpoint or default_endpoint()
+        key = key or load_key()
+    except OSError:
+        # Sin carpeta privada ni clave no hay IPC segura: se arranca sin ella
+        return Instance(args)
+
+    listener = _listen(endpoint, key)
+    if listener is None:
+        if forward(launch_command(args), endpoint, key):
+            sys.exit(0)
+        # El endpoint lo tiene otro (o la instancia no responde o no tiene
+        # nuestra clave): se arranca de forma independiente, sin IPC
+    return Instance(args, listener)
@@ -0,0 +1,122 @@
+"""
+Diario de estado (solo agregar) para restaurar temporizadores tras un cierre o un fallo
+"""
+
+import json
+import os
+import sys
+import time
+
+# Registros agregados antes de reescribir el diario compactado
+COMPACT_RECORDS = 200
+# Diferencia tolerada entre el reloj monotónico y el de pared (segundos)
+CLOCK_TOLERANCE = 2.0
+
+def default_state_path():
+    """Ruta del diario en la carpeta de datos del usuario"""
+    if sys.platform.startswith("win"):
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+    return os.path.join(base, "Temporizador", "state.jsonl")
+
+def anchor():
+    """Marca de tiempo doble: reloj de pared y monotónico"""
+    return {"wall": time.time(), "mono": time.monotonic()}
+
+def elapsed_since(mark):
+    """Segundos transcurridos desde `mark`"""
+    wall = time.time() - mark["wall"]
+    mono = time.monotonic() - mark["mono"]
+    if mono < 0:
+        # El equipo se reinició: solo queda el reloj de pared
+        return max(0.0, wall)
+    # El monotónico es inmune a cambios de hora, pero en algunos sistemas
+    # no avanza durante la suspensión: si el de pared va muy adelante, gana
+    return mono if mono >= wall - CLOCK_TOLERANCE else wall
+
+class StateJournal:
+    """Clave -> valor persistido como registros JSON; el último registro gana"""
+
+    def __init__(self, path=None, compact_records=COMPACT_RECORDS):
+        self.path = path or default_state_path()
+        self.compact_records = compact_records
+        self.state = {}
+        self._records = 0
+        self._file = None
+
+    def load(self):
+        """Lee el diario, lo compacta y lo deja abierto para agregar"""
+        self.state = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Línea cortada por un fallo a mitad de escritura
+                        continue
+                    self._apply(record.get("key"), record.get("value"))
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return self.state
+
+        self.compact()
+        return dict(self.state)
+
+    def record(self, key, value):
+        """Guarda un cambio de estado; `None` elimina la clave"""
+        if self.state.get(key) == value:
+            return
+        self._apply(key, value)
+        if self._file is None:
+            return
+
+        try:
+            self._file.write(json.dumps({"key": key, "value": value}, ensure_ascii=False) + "\n")
+            self._file.flush()
+        except OSError:
+            self._disable()
+            return
+
+        self._records += 1
+        if self._records >= self.compact_records:
+            self.compact()
+
+    def compact(self):
+        """Reescribe el diario con solo el estado vigente (reemplazo atómico)"""
+        self._disable()
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                for key, value in self.state.items():
+                    f.write(json.dumps({"key": key, "value": value}, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._records = 0
+        except OSError:
+            self._disable()
+
+    def close(self):
+        """Cierra el diario"""
+        self._disable()
+
+    def _apply(self, key, value):
+        if key is None:
+            return
+        if value is None:
+            self.state.pop(key, None)
+        else:
+            self.state[key] = value
+
+    def _disable(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
@@ -0,0 +1,50 @@
+"""
+Registro compartido de fuentes y estilos de botones, a partir de config.COLORS
+"""
+
+import functools
+
+import customtkinter as ctk
+
+import config
+
+# Fuentes por rol; cada una se crea una sola vez y la comparten todos los widgets
+FONT_SPECS = {
+    "body": {},                   # la del tema: la que cada widget crearía por su cuenta
+    "display": {"size": 28, "weight": "bold"},
+    "small": {"size": 11},
+    "mono": {"family": "Consolas", "size": 10},
+}
+
+def darken(color, factor=0.75):
+    """Versión más oscura de un color "#rrggbb" (para el hover)"""
+    value = int(color.lstrip("#"), 16)
+    r, g, b = (value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF
+    return "#{:02x}{:02x}{:02x}".format(int(r * factor), int(g * factor), int(b * factor))
+
+def _button_style(color, text_color=None):
+    style = {"fg_color": color, "hover_color": darken(color)}
+    if text_color is not None:
+        style["text_color"] = text_color
+    return style
+
+# Estilos de botones por rol
+BUTTON_STYLES = {
+    "start": _button_style(config.COLORS['success']),
+    "pause": _button_style(config.COLORS['warning'], text_color=config.COLORS['dark']),
+    "reset": _button_style(config.COLORS['danger']),
+    "lap": _button_style(config.COLORS['info']),
+    "primary": _button_style(config.COLORS['primary']),
+    "tray": _button_style(config.COLORS['secondary']),
+}
+
+@functools.lru_cache(maxsize=None)
+def font(role):
+    """Fuente compartida del rol `role` (requiere que exista la ventana raíz)"""
+    return ctk.CTkFont(**FONT_SPECS[role])
+
+def button(role, **options):
+    """Opciones de un botón con el estilo `role` y la fuente compartida; `options` completa o reemplaza"""
+    style = dict(BUTTON_STYLES[role], font=font("body"))
+    style.update(options)
+    return style
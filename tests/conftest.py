@@ -0,0 +1,20 @@
+"""
+Configuración común de las pruebas: los módulos viven en la raíz del repositorio
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class FakeClock:
+    """Reloj manual: solo avanza con advance()"""
+
+    def __init__(self, now=0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, delta):
+        self.now += delta
@@ -0,0 +1,144 @@
+"""
+Pruebas de CronRule, parse_alarm y AlarmBook con relojes manuales
+
+Las fechas se construyen en hora local (como las usa el módulo) y en enero,
+lejos de los cambios de horario de verano.
+"""
+
+import datetime
+
+import pytest
+
+from alarms import AlarmBook, CronRule, MISSED_GRACE, MAX_SLEEP, parse_alarm
+from conftest import FakeClock
+
+def at(*fields):
+    return datetime.datetime(*fields).timestamp()
+
+def test_next_after_is_strictly_later():
+    rule = CronRule("30 7 * * *")
+    assert rule.next_after(at(2025, 1, 6, 6, 0)) == at(2025, 1, 6, 7, 30)
+    assert rule.next_after(at(2025, 1, 6, 7, 30)) == at(2025, 1, 7, 7, 30)
+    assert rule.next_after(at(2025, 1, 6, 7, 29, 59)) == at(2025, 1, 6, 7, 30)
+
+def test_next_after_steps_lists_and_ranges():
+    rule = CronRule("*/15 9-10,14 * * *")
+    assert rule.next_after(at(2025, 1, 6, 9, 50)) == at(2025, 1, 6, 10, 0)
+    assert rule.next_after(at(2025, 1, 6, 10, 45)) == at(2025, 1, 6, 14, 0)
+    assert rule.next_after(at(2025, 1, 6, 14, 45)) == at(2025, 1, 7, 9, 0)
+
+def test_next_after_weekdays_and_days():
+    # 2025-01-10 es viernes; lunes a viernes a las 8:00
+    weekdays = CronRule("0 8 * * 1-5")
+    assert weekdays.next_after(at(2025, 1, 10, 9, 0)) == at(2025, 1, 13, 8, 0)
+    # Con día y día de la semana restringidos basta con uno (domingo = 0 o 7)
+    either = CronRule("0 8 15 * 7")
+    assert either.next_after(at(2025, 1, 10, 9, 0)) == at(2025, 1, 12, 8, 0)
+    assert either.next_after(at(2025, 1, 12, 9, 0)) == at(2025, 1, 15, 8, 0)
+
+def test_next_after_leap_day():
+    rule = CronRule("0 0 29 2 *")
+    assert rule.next_after(at(2025, 1, 1, 0, 0)) == at(2028, 2, 29, 0, 0)
+
+def test_rule_that_never_fires():
+    assert CronRule("0 0 31 2 *").next_after(at(2025, 1, 1)) is None
+    with pytest.raises(ValueError):
+        parse_alarm("0 0 31 2 *", at(2025, 1, 1))
+
+@pytest.mark.parametrize("spec", ["0 0 * *", "60 * * * *", "* 24 * * *", "*/0 * * * *"])
+def test_invalid_rules(spec):
+    with pytest.raises(ValueError):
+        CronRule(spec)
+
+def test_parse_one_shot_alarms():
+    now = at(2025, 1, 6, 12, 0)
+    assert parse_alarm("14:30", now) == (None, at(2025, 1, 6, 14, 30))
+    assert parse_alarm("11:00", now) == (None, at(2025, 1, 7, 11, 0))
+    assert parse_alarm("2025-01-08 09:15", now) == (None, at(2025, 1, 8, 9, 15))
+    with pytest.raises(ValueError):
+        parse_alarm("2025-01-05 09:15", now)
+    with pytest.raises(ValueError):
+        parse_alarm("mañana", now)
+
+def make_book(start):
+    wall = FakeClock(start)
+    mono = FakeClock(1000.0)
+    return wall, mono, AlarmBook(wall, mono)
+
+def advance(wall, mono, seconds):
+    wall.advance(seconds)
+    mono.advance(seconds)
+
+def test_check_fires_due_alarms_once():
+    wall, mono, book = make_book(at(2025, 1, 6, 7, 0))
+    book.add("café", "7:05")
+    book.add("diaria", "0 8 * * *")
+    assert book.wakeup_delay() == MAX_SLEEP
+
+    advance(wall, mono, 301)
+    fired, missed, jumped = book.check()
+    assert fired == [("café", pytest.approx(1))]
+    assert (missed, jumped) == ([], False)
+    assert "café" not in book
+    assert book.next_fire() == at(2025, 1, 6, 8, 0)
+
+    advance(wall, mono, 3600)
+    fired, _, _ = book.check()
+    assert [name for name, _ in fired] == ["diaria"]
+    assert book.next_fire() == at(2025, 1, 7, 8, 0)
+
+def test_check_after_suspend_fires_recent_and_reports_old():
+    wall, mono, book = make_book(at(2025, 1, 6, 7, 0))
+    book.add("reciente", "9:30")
+    book.add("vieja", "7:30")
+    book.add("diaria", "*/10 * * * *")
+
+    # Suspensión: el de pared avanza tres horas, el monotónico casi nada
+    wall.advance(3 * 3600)
+    mono.advance(1)
+    fired, missed, jumped = book.check()
+    assert jumped
+    assert sorted(name for name, _ in fired) == ["reciente"]
+    assert missed == ["vieja"]
+    # La recurrente perdida hace más de MISSED_GRACE no suena, pero sigue programada
+    assert book.next_fire() == at(2025, 1, 6, 10, 10)
+    assert len(book) == 1
+
+def test_recurring_alarm_late_within_grace_fires_once():
+    wall, mono, book = make_book(at(2025, 1, 6, 7, 0))
+    book.add("cada cinco", "*/5 * * * *")
+    wall.advance(MISSED_GRACE / 2)
+    mono.advance(1)
+    fired, missed, jumped = book.check()
+    assert jumped
+    assert [name for name, _ in fired] == ["cada cinco"]
+    assert missed == []
+    assert book.next_fire() == at(2025, 1, 6, 7, 35)
+
+def test_check_recomputes_recurring_alarm_when_clock_goes_back():
+    wall, mono, book = make_book(at(2025, 1, 6, 9, 0))
+    book.add("en punto", "0 * * * *")
+    book.add("única", "9:30")
+    assert book.next_fire() == at(2025, 1, 6, 9, 30)
+
+    # La hora del sistema retrocede dos horas
+    wall.advance(-2 * 3600)
+    mono.advance(1)
+    fired, missed, jumped = book.check()
+    assert jumped
+    assert (fired, missed) == ([], [])
+    upcoming = {alarm.name: alarm.next for alarm in book.upcoming(5)}
+    assert upcoming == {"en punto": at(2025, 1, 6, 8, 0), "única": at(2025, 1, 6, 9, 30)}
+
+def test_snapshot_and_restore_keep_past_fire():
+    wall, mono, book = make_book(at(2025, 1, 6, 7, 0))
+    book.add("diaria", "0 8 * * *")
+    snapshot = book.snapshot("diaria")
+    assert snapshot == {"spec": "0 8 * * *", "next": at(2025, 1, 6, 8, 0)}
+    assert book.snapshot("otra") is None
+
+    restored = AlarmBook(FakeClock(at(2025, 1, 6, 8, 10)), FakeClock(0.0))
+    restored.restore("diaria", snapshot)
+    fired, _, _ = restored.check()
+    assert fired == [("diaria", pytest.approx(600))]
+    assert restored.next_fire() == at(2025, 1, 7, 8, 0)
@@ -0,0 +1,40 @@
+"""
+Pruebas de Instrumentation con un reloj manual
+"""
+
+from conftest import FakeClock
+from instrumentation import Instrumentation
+
+class Widget:
+    def update_display(self):
+        pass
+
+def test_scheduled_instrumented_method_is_counted_once_per_layer():
+    probe = Instrumentation(enabled=True, clock=FakeClock())
+    widget = Widget()
+    probe.instrument(widget, "update_display")
+    probe.run_scheduled(widget.update_display, 0.002)
+
+    callbacks = probe.snapshot()["callbacks"]
+    assert callbacks["update_display"]["count"] == 1
+    assert callbacks["job:update_display"]["count"] == 1
+    assert probe.after_delay.count == 1
+
+def test_renders_count_real_configure_calls():
+    clock = FakeClock()
+    probe = Instrumentation(enabled=True, clock=clock)
+    probe.rendered("timer")
+    probe.rendered("stopwatch", 3)
+    probe.rendered("timer")
+    clock.advance(2)
+
+    snapshot = probe.snapshot()
+    assert snapshot["renders"] == {"stopwatch": 3, "timer": 2}
+    assert snapshot["renders_per_second"] == {"stopwatch": 1.5, "timer": 1.0}
+
+def test_disabled_wrapper_records_nothing():
+    probe = Instrumentation(enabled=False, clock=FakeClock())
+    widget = Widget()
+    probe.instrument(widget, "update_display")
+    widget.update_display()
+    assert probe.callbacks == {}
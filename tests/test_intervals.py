@@ -0,0 +1,46 @@
+"""
+Pruebas de IntervalProgram.locate
+"""
+
+import pytest
+
+from intervals import IntervalProgram, compile_programs
+
+@pytest.fixture
+def pomodoro():
+    return IntervalProgram("pomodoro", [("trabajo", 25), ("descanso", 5)], repeat=3)
+
+def test_locate_inside_phases(pomodoro):
+    assert pomodoro.total == 90
+    assert len(pomodoro) == 6
+    assert pomodoro.locate(0) == (0, "trabajo", 25)
+    assert pomodoro.locate(10) == (0, "trabajo", 15)
+    assert pomodoro.locate(27) == (1, "descanso", 3)
+    assert pomodoro.locate(61) == (4, "trabajo", 24)
+
+def test_exact_phase_end_belongs_to_next_phase(pomodoro):
+    assert pomodoro.locate(25) == (1, "descanso", 5)
+    assert pomodoro.locate(30) == (2, "trabajo", 25)
+    assert pomodoro.locate(55) == (3, "descanso", 5)
+    assert pomodoro.locate(60) == (4, "trabajo", 25)
+
+def test_locate_clamps_outside_the_program(pomodoro):
+    assert pomodoro.locate(-1) == (0, "trabajo", 25)
+    assert pomodoro.locate(90) == (5, "descanso", 0.0)
+    assert pomodoro.locate(1000) == (5, "descanso", 0.0)
+    index, name, left = pomodoro.locate(89.999)
+    assert (index, name) == (5, "descanso")
+    assert left == pytest.approx(0.001)
+
+def test_invalid_programs_are_rejected():
+    with pytest.raises(ValueError):
+        IntervalProgram("vacío", [])
+    with pytest.raises(ValueError):
+        IntervalProgram("cero", [("a", 0)])
+    with pytest.raises(ValueError):
+        IntervalProgram("sin ciclos", [("a", 1)], repeat=0)
+
+def test_compile_programs():
+    programs = compile_programs([("hiit", [("esfuerzo", 20), ("pausa", 10)], 8)])
+    assert programs["hiit"].total == 240
+    assert programs["hiit"].phase_name(7) == "pausa"
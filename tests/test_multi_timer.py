@@ -0,0 +1,79 @@
+"""
+Pruebas de MultiTimerQueue con un reloj manual
+"""
+
+import pytest
+
+from conftest import FakeClock
+from multi_timer import MultiTimerQueue
+
+def test_nearest_returns_closest_in_order():
+    clock = FakeClock()
+    queue = MultiTimerQueue(clock)
+    for index, seconds in enumerate([50, 10, 40, 20, 30, 60, 5]):
+        queue.add(f"t{index}", seconds)
+    clock.advance(2)
+    assert queue.nearest(3) == [("t6", pytest.approx(3)), ("t1", pytest.approx(8)),
+                                ("t3", pytest.approx(18))]
+    assert len(queue.nearest(100)) == 7
+    assert queue.nearest(0) == []
+
+def test_nearest_skips_cancelled_entries():
+    clock = FakeClock()
+    queue = MultiTimerQueue(clock)
+    for index in range(10):
+        queue.add(f"t{index}", index + 1)
+    queue.cancel("t0")
+    queue.cancel("t2")
+    assert [name for name, _ in queue.nearest(3)] == ["t1", "t3", "t4"]
+
+def test_replacing_a_timer_keeps_only_the_new_deadline():
+    clock = FakeClock()
+    queue = MultiTimerQueue(clock)
+    queue.add("tea", 10)
+    queue.add("tea", 30)
+    assert len(queue) == 1
+    assert queue.next_deadline() == 30
+    clock.advance(10)
+    assert queue.pop_expired() == []
+
+def test_pop_expired_and_next_deadline():
+    clock = FakeClock()
+    queue = MultiTimerQueue(clock)
+    queue.add("a", 5)
+    queue.add("b", 1)
+    queue.add("c", 9)
+    queue.cancel("b")
+    assert queue.next_deadline() == 5
+    clock.advance(9)
+    assert queue.pop_expired() == ["a", "c"]
+    assert len(queue) == 0
+    assert queue.next_deadline() is None
+
+def test_cancel_compacts_the_heap():
+    clock = FakeClock()
+    queue = MultiTimerQueue(clock)
+    for index in range(200):
+        queue.add(f"t{index}", index + 1)
+
+    # Hasta la mitad del heap las entradas canceladas se dejan estar
+    for index in range(100):
+        queue.cancel(f"t{index}")
+    assert len(queue._heap) == 200
+    assert queue._stale == 100
+
+    queue.cancel("t100")
+    assert len(queue._heap) == 99
+    assert queue._stale == 0
+    assert all(entry[4] for entry in queue._heap)
+    assert queue.next_deadline() == 102
+    assert [name for name, _ in queue.nearest(2)] == ["t101", "t102"]
+    assert not queue.cancel("t0")
+
+@pytest.mark.parametrize("seconds", [float("inf"), float("nan")])
+def test_add_rejects_non_finite_durations(seconds):
+    queue = MultiTimerQueue(FakeClock())
+    with pytest.raises(ValueError):
+        queue.add("roto", seconds)
+    assert len(queue) == 0
+    assert queue.next_deadline() is None
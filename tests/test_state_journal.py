@@ -0,0 +1,45 @@
+"""
+Pruebas de StateJournal sobre archivos temporales
+"""
+
+import json
+
+from state_journal import StateJournal
+
+def test_record_and_reload(tmp_path):
+    path = str(tmp_path / "state.jsonl")
+    journal = StateJournal(path)
+    journal.load()
+    journal.record("timer", {"remaining": 10})
+    journal.record("stopwatch", {"elapsed": 1.5})
+    journal.record("timer", None)
+    journal.close()
+
+    assert StateJournal(path).load() == {"stopwatch": {"elapsed": 1.5}}
+
+def test_replay_ignores_torn_last_line(tmp_path):
+    path = tmp_path / "state.jsonl"
+    lines = [json.dumps({"key": "a", "value": 1}), json.dumps({"key": "b", "value": 2}),
+             json.dumps({"key": "a", "value": 3})]
+    # El último registro quedó a medio escribir
+    path.write_text("\n".join(lines) + '\n{"key": "b", "val', encoding="utf-8")
+
+    journal = StateJournal(str(path))
+    assert journal.load() == {"a": 3, "b": 2}
+
+    # La carga compacta el diario y sigue agregando sin arrastrar la línea rota
+    journal.record("c", 4)
+    journal.close()
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert records == [{"key": "a", "value": 3}, {"key": "b", "value": 2}, {"key": "c", "value": 4}]
+
+def test_compacts_after_too_many_records(tmp_path):
+    path = tmp_path / "state.jsonl"
+    journal = StateJournal(str(path), compact_records=5)
+    journal.load()
+    for value in range(12):
+        journal.record("counter", value)
+    journal.close()
+
+    assert len(path.read_text(encoding="utf-8").splitlines()) <= 5
+    assert StateJournal(str(path)).load() == {"counter": 11}
@@ -0,0 +1,237 @@
+"""
+Pruebas de Timer, Stopwatch y MainLoopScheduler con relojes manuales
+"""
+
+import pytest
+
+from conftest import FakeClock
+from timer_core import Timer, Stopwatch, MainLoopScheduler, IDLE, RUNNING, PAUSED
+
+def test_timer_counts_down_from_deadline():
+    clock = FakeClock(100.0)
+    timer = Timer(clock)
+    timer.start(10)
+    clock.advance(3.5)
+    assert timer.remaining() == pytest.approx(6.5)
+    assert timer.remaining_seconds() == 7
+    clock.advance(7)
+    assert timer.remaining() == 0.0
+    assert timer.expired()
+
+def test_timer_pause_freezes_and_resume_continues():
+    clock = FakeClock()
+    timer = Timer(clock)
+    timer.start(10)
+    clock.advance(2)
+    timer.pause()
+    clock.advance(100)
+    assert timer.paused
+    assert timer.remaining() == pytest.approx(8)
+    assert not timer.expired()
+
+    timer.resume()
+    clock.advance(3)
+    assert timer.running
+    assert timer.remaining() == pytest.approx(5)
+
+    # Pausar dos veces no acumula la pausa dos veces
+    timer.pause()
+    timer.pause()
+    clock.advance(1)
+    timer.resume()
+    timer.resume()
+    assert timer.remaining() == pytest.approx(5)
+
+def test_timer_snapshot_and_restore():
+    clock = FakeClock()
+    timer = Timer(clock)
+    assert timer.snapshot() is None
+    timer.start(60)
+    clock.advance(15)
+    timer.pause()
+    snapshot = timer.snapshot()
+    assert snapshot == {"state": PAUSED, "remaining": 45, "duration": 60}
+
+    restored = Timer(clock)
+    restored.restore(snapshot)
+    clock.advance(30)
+    assert restored.paused
+    assert restored.remaining() == pytest.approx(45)
+    assert restored.fraction_remaining() == pytest.approx(0.75)
+
+    restored.restore(dict(snapshot, state=RUNNING))
+    clock.advance(5)
+    assert restored.remaining() == pytest.approx(40)
+
+    restored.restore(None)
+    assert restored.state == IDLE
+
+def test_stopwatch_pause_keeps_integer_nanoseconds():
+    clock = FakeClock(1000)
+    stopwatch = Stopwatch(clock)
+    stopwatch.start()
+    clock.advance(1_500_000_000)
+    stopwatch.pause()
+    clock.advance(10 ** 12)
+    stopwatch.start()
+    clock.advance(250_000_000)
+    assert stopwatch.elapsed_ns() == 1_750_000_000
+    assert stopwatch.elapsed() == pytest.approx(1.75)
+
+def test_stopwatch_laps_and_splits():
+    clock = FakeClock()
+    stopwatch = Stopwatch(clock)
+    assert stopwatch.lap() is None
+
+    stopwatch.start()
+    clock.advance(2_000_000_000)
+    assert stopwatch.lap() == (1, pytest.approx(2.0), pytest.approx(2.0))
+    clock.advance(3_000_000_000)
+    # Una vuelta marcada en un instante anterior del reloj (la pulsación)
+    assert stopwatch.lap(at=clock.now - 500_000_000) == (2, pytest.approx(4.5), pytest.approx(2.5))
+    assert stopwatch.laps.best == pytest.approx(2.0)
+
+    stopwatch.pause()
+    assert stopwatch.lap() is None
+    assert len(stopwatch.laps) == 2
+
+def test_stopwatch_snapshot_and_restore():
+    clock = FakeClock()
+    stopwatch = Stopwatch(clock)
+    assert stopwatch.snapshot() is None
+    stopwatch.start()
+    clock.advance(12_345_000_000)
+    snapshot = stopwatch.snapshot()
+    assert snapshot == {"state": RUNNING, "elapsed": pytest.approx(12.345)}
+
+    restored = Stopwatch(clock)
+    restored.restore(snapshot)
+    assert restored.running
+    assert restored.elapsed_ns() == 12_345_000_000
+    clock.advance(1_000_000_000)
+    assert restored.elapsed() == pytest.approx(13.345)
+
+    restored.restore(dict(snapshot, state=PAUSED))
+    clock.advance(1_000_000_000)
+    assert restored.paused
+    assert restored.elapsed_ns() == 12_345_000_000
+
+def test_stopwatch_restore_keeps_laps():
+    clock = FakeClock()
+    stopwatch = Stopwatch(clock)
+    stopwatch.start()
+    for seconds in (3, 5, 4):
+        clock.advance(seconds * 1_000_000_000)
+        stopwatch.lap()
+    clock.advance(1_000_000_000)
+    snapshot = stopwatch.snapshot()
+    assert snapshot["laps"] == [pytest.approx(3), pytest.approx(8), pytest.approx(12)]
+
+    restored = Stopwatch(clock)
+    restored.restore(snapshot)
+    assert list(restored.laps.splits) == [pytest.approx(3), pytest.approx(5), pytest.approx(4)]
+    assert restored.laps.best == pytest.approx(3)
+    assert restored.laps.worst == pytest.approx(5)
+
+    # La siguiente vuelta continúa la numeración y su parcial sale de la anterior
+    clock.advance(1_000_000_000)
+    assert restored.lap() == (4, pytest.approx(14), pytest.approx(2))
+
+class FakeHost:
+    """Imitación de after/after_cancel de Tk; run_due() hace de bucle principal"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.jobs = {}
+        self._next = 0
+
+    def after(self, delay_ms, callback):
+        self._next += 1
+        self.jobs[self._next] = (self.clock() + delay_ms / 1000, callback)
+        return self._next
+
+    def after_cancel(self, after_id):
+        del self.jobs[after_id]
+
+    def run_due(self):
+        for after_id, (when, callback) in sorted(self.jobs.items(), key=lambda item: item[1][0]):
+            if after_id in self.jobs and when <= self.clock():
+                del self.jobs[after_id]
+                callback()
+
+def make_scheduler():
+    clock = FakeClock()
+    host = FakeHost(clock)
+    return clock, host, MainLoopScheduler(host, clock)
+
+def test_scheduler_keeps_a_single_host_wakeup():
+    clock, host, scheduler = make_scheduler()
+    calls = []
+    scheduler.call_later(2, lambda: calls.append("b"))
+    scheduler.call_later(1, lambda: calls.append("a"))
+    scheduler.call_later(3, lambda: calls.append("c"))
+    assert len(host.jobs) == 1
+    assert len(scheduler) == 3
+
+    clock.advance(2)
+    host.run_due()
+    assert calls == ["a", "b"]
+    assert len(host.jobs) == 1
+    assert len(scheduler) == 1
+
+def test_scheduler_cancel_before_run():
+    clock, host, scheduler = make_scheduler()
+    calls = []
+    first = scheduler.call_later(1, lambda: calls.append("first"))
+    scheduler.call_later(2, lambda: calls.append("second"))
+    scheduler.cancel(first)
+    assert len(scheduler) == 1
+
+    clock.advance(5)
+    host.run_due()
+    assert calls == ["second"]
+    assert not scheduler._cancelled
+    assert not host.jobs
+
+def test_scheduler_cancel_after_run_does_not_leak():
+    clock, host, scheduler = make_scheduler()
+    job = scheduler.call_later(1, lambda: None)
+    clock.advance(1)
+    host.run_due()
+    scheduler.cancel(job)
+    scheduler.cancel(job)
+    assert not scheduler._cancelled
+    assert len(scheduler) == 0
+
+def test_scheduler_self_cancelling_tick_does_not_leak():
+    # Como los ticks de la app: cada callback cancela su propio id y se reprograma
+    clock, host, scheduler = make_scheduler()
+    state = {"job": None, "runs": 0}
+
+    def tick():
+        scheduler.cancel(state["job"])
+        state["runs"] += 1
+        state["job"] = scheduler.call_later(0.125, tick)
+
+    state["job"] = scheduler.call_later(0.125, tick)
+    for _ in range(1000):
+        clock.advance(0.125)
+        host.run_due()
+    assert state["runs"] == 1000
+    assert len(scheduler) == 1
+    assert len(scheduler._queue) == 1
+    assert not scheduler._cancelled
+
+@pytest.mark.parametrize("when", [float("inf"), float("-inf"), float("nan")])
+def test_scheduler_rejects_non_finite_times(when):
+    clock, host, scheduler = make_scheduler()
+    calls = []
+    scheduler.call_later(1, lambda: calls.append("tick"))
+    with pytest.raises(ValueError):
+        scheduler.call_at(when, lambda: calls.append("bad"))
+
+    # El resto de los relojes sigue funcionando
+    clock.advance(1)
+    host.run_due()
+    assert calls == ["tick"]
+    assert len(scheduler) == 0
@@ -0,0 +1,55 @@
+"""
+Formateo de tiempos a partir de segmentos precalculados ("00".."99")
+"""
+
+import time
+
+_SEGMENTS = tuple(f"{i:02d}" for i in range(100))
+_DIGITS = "0123456789"
+_WEEKDAYS = ("lun", "mar", "mié", "jue", "vie", "sáb", "dom")
+
+def two_digits(value):
+    """Segmento de dos dígitos (o más si el valor no entra)"""
+    return _SEGMENTS[value] if value < 100 else str(value)
+
+def format_hms(total_seconds):
+    """HH:MM:SS a partir de segundos enteros"""
+    minutes, seconds = divmod(int(total_seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{two_digits(hours)}:{_SEGMENTS[minutes]}:{_SEGMENTS[seconds]}"
+
+def format_tenths(tenths):
+    """HH:MM:SS.d a partir de décimas de segundo enteras"""
+    seconds, tenth = divmod(int(tenths), 10)
+    return f"{format_hms(seconds)}.{_DIGITS[tenth]}"
+
+def format_hundredths(hundredths):
+    """HH:MM:SS.cc a partir de centésimas de segundo enteras"""
+    seconds, cents = divmod(int(hundredths), 100)
+    return f"{format_hms(seconds)}.{_SEGMENTS[cents]}"
+
+def format_milliseconds(milliseconds):
+    """HH:MM:SS.mmm a partir de milésimas de segundo enteras"""
+    seconds, milli = divmod(int(milliseconds), 1000)
+    return f"{format_hms(seconds)}.{milli:03d}"
+
+def format_short(seconds, decimals=1):
+    """MM:SS.d (o con `decimals` decimales), o HH:MM:SS.d si pasa de una hora"""
+    scale = 10 ** decimals
+    # El épsilon evita que 1.23 (en binario 1.2299...) se muestre como 1.22
+    whole, fraction = divmod(int(seconds * scale + 1e-6), scale)
+    minutes, secs = divmod(whole, 60)
+    hours, minutes = divmod(minutes, 60)
+    if decimals == 1:
+        tail = _DIGITS[fraction]
+    else:
+        tail = f"{fraction:0{decimals}d}"
+    if hours > 0:
+        return f"{two_digits(hours)}:{_SEGMENTS[minutes]}:{_SEGMENTS[secs]}.{tail}"
+    return f"{_SEGMENTS[minutes]}:{_SEGMENTS[secs]}.{tail}"
+
+def format_wall(timestamp):
+    """Día de la semana, fecha y hora local de una marca del reloj de pared ("lun 14/10 07:30")"""
+    moment = time.localtime(timestamp)
+    return (f"{_WEEKDAYS[moment.tm_wday]} {_SEGMENTS[moment.tm_mday]}/{_SEGMENTS[moment.tm_mon]} "
+            f"{_SEGMENTS[moment.tm_hour]}:{_SEGMENTS[moment.tm_min]}")
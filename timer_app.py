@@ -1,19 +1,276 @@
+import time
+
+# Referencia para medir el tiempo de arranque (antes de cualquier import pesado)
+_STARTUP_T0 = time.perf_counter()
+
+import sys
+from single_instance import claim_instance
+
+# Si ya hay una instancia abierta se le reenvían los argumentos y se sale sin cargar Tk
+if __name__ == "__main__":
+    _INSTANCE = claim_instance(sys.argv[1:])
+
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import customtkinter as ctk
-from PIL import Image, ImageTk
-import threading
-import time
+import collections
+import gc
+import math
 import os
-import sys
-from datetime import datetime, timedelta
-import pystray
-from pystray import MenuItem as item
+import threading
+import config
+from timer_core import (
+    Timer, Stopwatch, MainLoopScheduler, IDLE, STOPWATCH_SCALES,
+    timer_phase, timer_tick_delay, stopwatch_step, stopwatch_tick_delay,
+)
+from intervals import compile_programs
+from multi_timer import MultiTimerQueue
+from alarms import AlarmBook
+from lap_export import LapExporter, FLUSH_INTERVAL
+from state_journal import StateJournal, anchor, elapsed_since, CLOCK_TOLERANCE
+from instrumentation import Instrumentation
+from time_format import format_hms, format_tenths, format_hundredths, format_milliseconds, format_short, format_wall
+from notifications import Notifier
+import styles
+
+# Filas visibles en la lista de temporizadores múltiples
+MULTI_TIMER_ROWS = 4
+
+# Filas visibles en la lista de alarmas
+ALARM_ROWS = 4
+
+# Filas visibles (y widgets existentes) en la lista de vueltas
+LAP_ROWS = 3
+
+# Modos del display del cronómetro: (unidades por segundo, decimales, formato)
+STOPWATCH_MODES = {
+    "tenths": (STOPWATCH_SCALES["tenths"], 1, format_tenths),
+    "centiseconds": (STOPWATCH_SCALES["centiseconds"], 2, format_hundredths),
+    "milliseconds": (STOPWATCH_SCALES["milliseconds"], 3, format_milliseconds),
+}
+
+# Texto del selector de programas de intervalos cuando no hay uno en curso
+PROGRAM_MENU_TEXT = "🔁 Intervalos"
+
+# Segundos que el banner de aviso queda visible con la ventana abierta
+BANNER_SECONDS = 10
+
+# Tiempo máximo (segundos) que un drenado de comandos retiene el bucle de Tk
+INBOX_BUDGET = 0.008
 
 # Configuración de CustomTkinter
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
+class StartupTrace:
+    """Tiempo hasta el primer cuadro, informado al estilo de `-X importtime`"""
+    
+    def __init__(self, t0):
+        self.t0 = t0
+        self.marks = []
+        # Se activa con `python -X importtime` o con TEMPORIZADOR_STARTUP_TRACE=1
+        self.enabled = "importtime" in sys._xoptions or bool(os.environ.get("TEMPORIZADOR_STARTUP_TRACE"))
+    
+    def mark(self, phase):
+        """Registra el fin de una fase del arranque"""
+        self.marks.append((phase, time.perf_counter()))
+    
+    def total_ms(self):
+        """Milisegundos desde el inicio hasta la última marca"""
+        return (self.marks[-1][1] - self.t0) * 1000 if self.marks else 0.0
+    
+    def report(self):
+        """Escribe las fases en stderr y compara con el presupuesto de arranque"""
+        if not self.enabled:
+            return
+        
+        print("startup time: self [us] | cumulative | phase", file=sys.stderr)
+        previous = self.t0
+        for phase, when in self.marks:
+            self_us = int((when - previous) * 1e6)
+            cumulative_us = int((when - self.t0) * 1e6)
+            print(f"startup time: {self_us:>9} | {cumulative_us:>10} | {phase}", file=sys.stderr)
+            previous = when
+        
+        total = self.total_ms()
+        verdict = "OK" if total <= config.STARTUP_BUDGET_MS else "EXCEDIDO"
+        print(
+            f"startup time: primer cuadro en {total:.0f} ms "
+            f"(presupuesto {config.STARTUP_BUDGET_MS} ms) {verdict}",
+            file=sys.stderr
+        )
+
+startup_trace = StartupTrace(_STARTUP_T0)
+startup_trace.mark("imports")
+
+class CachedLabel:
+    """Envuelve un label y solo lo reconfigura cuando cambia lo que se ve"""
+    
+    def __init__(self, widget, probe=None, name="label"):
+        self.widget = widget
+        self.probe = probe            # instrumentación opcional (cuenta los configure reales)
+        self.name = name
+        self.text = widget.cget("text")
+        self.color = None
+        self.key = None
+    
+    def show(self, text, color=None, key=None):
+        """Muestra `text` (y `color`); no toca el widget si nada cambió"""
+        self.key = key
+        changes = {}
+        if text != self.text:
+            self.text = changes["text"] = text
+        if color is not None and color != self.color:
+            self.color = changes["text_color"] = color
+        if changes:
+            self.widget.configure(**changes)
+            if self.probe is not None and self.probe.enabled:
+                self.probe.rendered(self.name)
+    
+    def show_key(self, key, formatter, color=None):
+        """Como show(), pero solo formatea el texto si cambió `key`"""
+        if key == self.key and (color is None or color == self.color):
+            return
+        self.show(formatter(key), color, key)
+
+class LapListView(ctk.CTkFrame):
+    """Lista virtualizada: un conjunto fijo de filas que se reutiliza al desplazarse"""
+    
+    def __init__(self, master, row_text, rows=LAP_ROWS, **kwargs):
+        super().__init__(master, **kwargs)
+        self.row_text = row_text      # índice -> texto de la fila
+        self.rows = rows
+        self.count = 0
+        self.first = 0
+        self.follow = True            # seguir la última vuelta mientras se agregan
+        self._texts = [""] * rows
+        
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        
+        rows_frame = ctk.CTkFrame(self, fg_color="transparent")
+        rows_frame.pack(side="left", fill="both", expand=True)
+        self.labels = []
+        for _ in range(rows):
+            label = ctk.CTkLabel(rows_frame, text="", anchor="w", font=styles.font("body"), height=18)
+            label.pack(fill="x", padx=3)
+            label.bind("<MouseWheel>", self.on_mouse_wheel)
+            label.bind("<Button-4>", self.on_mouse_wheel)
+            label.bind("<Button-5>", self.on_mouse_wheel)
+            self.labels.append(label)
+        
+        self.render()
+    
+    def set_count(self, count):
+        """Actualiza la cantidad de filas; solo se redibujan las visibles"""
+        self.count = count
+        if self.follow:
+            self.first = max(0, count - self.rows)
+        else:
+            self.first = min(self.first, max(0, count - self.rows))
+        self.render()
+    
+    def clear(self):
+        """Vacía la lista sin destruir widgets"""
+        self.follow = True
+        self.set_count(0)
+    
+    def scroll_to(self, first):
+        """Muestra las filas a partir del índice `first`"""
+        self.first = max(0, min(int(first), self.count - self.rows))
+        self.follow = self.first >= self.count - self.rows
+        self.render()
+    
+    def on_scroll(self, action, value, unit="units"):
+        """Comando de la barra de desplazamiento (protocolo de Tk)"""
+        if action == "moveto":
+            self.scroll_to(round(float(value) * self.count))
+        else:
+            step = self.rows if unit == "pages" else 1
+            self.scroll_to(self.first + int(value) * step)
+    
+    def on_mouse_wheel(self, event):
+        """Desplaza con la rueda del ratón"""
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.first - 1)
+        else:
+            self.scroll_to(self.first + 1)
+    
+    def render(self):
+        """Vuelve a llenar las filas visibles con los datos actuales"""
+        for offset, label in enumerate(self.labels):
+            index = self.first + offset
+            text = self.row_text(index) if index < self.count else ""
+            if text != self._texts[offset]:
+                self._texts[offset] = text
+                label.configure(text=text)
+        
+        if self.count > self.rows:
+            self.scrollbar.set(self.first / self.count, (self.first + self.rows) / self.count)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+class FixedRowList(ctk.CTkFrame):
+    """Filas fijas con botón de cancelar para los primeros elementos de una lista, y un resumen"""
+    
+    def __init__(self, master, row_text, on_cancel, empty_text, count_text, rows,
+                 probe=None, name="list", **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self.row_text = row_text      # clave -> texto de la fila
+        self.on_cancel = on_cancel    # nombre -> cancela ese elemento
+        self.empty_text = empty_text
+        self.count_text = count_text  # p. ej. "{} activos"
+        self.names = [None] * rows
+        
+        self.rows = []
+        for index in range(rows):
+            row = ctk.CTkFrame(self)
+            row.pack(fill="x", padx=5, pady=1)
+            label = ctk.CTkLabel(row, text="", anchor="w", font=styles.font("body"))
+            label.pack(side="left", fill="x", expand=True, padx=5)
+            cancel_btn = ctk.CTkButton(
+                row,
+                text="✖",
+                command=lambda i=index: self.cancel(i),
+                **styles.button("reset"),
+                state="disabled",
+                height=20,
+                width=24
+            )
+            cancel_btn.pack(side="right", padx=3)
+            self.rows.append((CachedLabel(label, probe, name), cancel_btn))
+        
+        summary = ctk.CTkLabel(self, text=empty_text, font=styles.font("small"))
+        summary.pack(pady=1)
+        self.summary = CachedLabel(summary, probe, name)
+    
+    def cancel(self, index):
+        """Cancela el elemento mostrado en la fila `index`"""
+        if self.names[index] is not None:
+            self.on_cancel(self.names[index])
+    
+    def show(self, items, total):
+        """Muestra `items` como pares (nombre, clave); solo cambia lo que cambió"""
+        for index, (label, cancel_btn) in enumerate(self.rows):
+            if index < len(items):
+                name, key = items[index]
+                label.show_key(key, self.row_text)
+            else:
+                name = None
+                label.show("")
+            
+            # El botón solo cambia de estado cuando la fila se llena o se vacía
+            if (name is None) != (self.names[index] is None):
+                cancel_btn.configure(state="disabled" if name is None else "normal")
+            self.names[index] = name
+        
+        if total == 0:
+            self.summary.show(self.empty_text)
+        elif total > len(self.rows):
+            self.summary.show(f"{self.count_text.format(total)} (y {total - len(self.rows)} más)")
+        else:
+            self.summary.show(self.count_text.format(total))
+
 class TimerApp:
     def __init__(self):
         self.root = ctk.CTk()
@@ -21,28 +278,109 @@ class TimerApp:
         self.root.geometry("500x250")
         self.root.resizable(False, False)
         
-        # Variables de control
-        self.timer_running = False
-        self.stopwatch_running = False
-        self.timer_thread = None
-        self.stopwatch_thread = None
-        self.timer_seconds = 0
-        self.stopwatch_seconds = 0
+        # Estado de los relojes (núcleo sin interfaz); esta clase solo los muestra
+        self.timer = Timer()
+        self.stopwatch = Stopwatch()
+        
+        # Programas de intervalos: el temporizador corre el total del programa y
+        # la fase en curso se busca en su línea de tiempo compilada
+        self.programs = compile_programs(config.INTERVAL_PROGRAMS)
+        self.program = None
+        self.program_phase = None
+        
+        # Instrumentación: siempre instalada, se activa con TEMPORIZADOR_PROFILE=1 o con F12
+        self.profile_default = bool(os.environ.get("TEMPORIZADOR_PROFILE"))
+        self.probe = Instrumentation(enabled=self.profile_default)
+        self.probe.instrument(
+            self,
+            "update_timer_display",
+            "update_stopwatch_display",
+            "update_multi_timer_list",
+            "update_lap_stats",
+            "mark_lap"
+        )
+        self.debug_overlay = None
+        self.debug_overlay_job = None
+        
+        # Vista de presentación a pantalla completa (F11)
+        self.presentation = None
+        self.presentation_clock = None
+        self.presentation_source = None
+        self.presentation_job = None
+        
+        # Todos los ticks se ejecutan en el bucle principal de Tk
+        self.scheduler = MainLoopScheduler(self.root, probe=self.probe)
+        self.timer_job = None
+        self.stopwatch_job = None
+        self.tray_refresh_job = None
+        
+        # Temporizadores múltiples: solo el más próximo programa un despertar
+        self.multi_timers = MultiTimerQueue()
+        self.multi_timer_job = None
+        self.multi_list_job = None
+        self.multi_timer_count = 0
+        
+        # Alarmas a una hora del reloj de pared: un solo despertar para la más próxima
+        self.alarms = AlarmBook()
+        self.alarm_job = None
+        self.alarm_count = 0
+        
+        # Avisos de fin de tiempo: banner en la ventana o notificación del tray, nunca modales
+        self.notifier = Notifier(self.scheduler, self.show_notification)
+        self.banner = None
+        self.banner_names = []
+        self.banner_job = None
+        
+        # Exportación continua de vueltas
+        self.lap_exporter = None
+        self.export_flush_job = None
+        
+        # Widgets de la vista: None mientras no existan (pestañas sin construir o
+        # vista liberada en el modo de bajo consumo del tray)
+        self.notebook = None
+        self.timer_label = None
+        self.saved_view = None
+        self.stopwatch_label = None
+        self.laps_view = None
+        self.export_btn = None
+        self.multi_list = None
+        self.alarm_list = None
+        
+        # Resolución del display del cronómetro (un clic en el display la cambia)
+        self.set_stopwatch_mode(config.STOPWATCH_DISPLAY)
         
         # Variables para el system tray
-        self.tray_icon = None
+        self.tray = None
+        self.tray_menu_state = None
+        self.tray_default_image = None
+        self.tray_progress_frames = ()
+        self.tray_frame = None
         self.is_minimized = False
         
         # Configurar para ejecutar en segundo plano
         self.root.protocol("WM_DELETE_WINDOW", self.minimize_to_tray)
         self.root.bind("<Unmap>", self.on_minimize)
+        self.root.bind("<F11>", self.toggle_presentation)
+        self.root.bind("<F12>", self.toggle_debug_overlay)
+        self.root.bind("<Control-Shift-D>", self.dump_instrumentation)
+        
+        # El icono del system tray (PIL + pystray) se crea al minimizar por primera vez
         
-        # Crear el icono del system tray
-        self.create_tray_icon()
+        # Comandos que llegan desde otros hilos (otra instancia, API de control):
+        # se drenan en el bucle de Tk
+        self.inbox = collections.deque()
+        self.inbox_lock = threading.Lock()
+        self.inbox_pending = False
+        self.control = None
         
         self.setup_ui()
         self.center_window()
         
+        # Restaurar los relojes que estaban corriendo al cerrar (o al fallar)
+        self.journal = StateJournal()
+        self.restore_state()
+        startup_trace.mark("window")
+        
     def center_window(self):
         """Centra la ventana en la pantalla"""
         self.root.update_idletasks()
@@ -58,28 +396,57 @@ class TimerApp:
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill="both", expand=True, padx=0, pady=0)
         
-        # Pestaña del Temporizador
+        # Pestaña del Temporizador (la visible al abrir: se construye ya)
         self.timer_frame = ctk.CTkFrame(self.notebook)
         self.notebook.add(self.timer_frame, text="⏰ Temporizador")
         self.setup_timer_tab()
         
-        # Pestaña del Cronómetro
+        # El resto de las pestañas se construye la primera vez que se seleccionan
         self.stopwatch_frame = ctk.CTkFrame(self.notebook)
         self.notebook.add(self.stopwatch_frame, text="⏱️ Cronómetro")
-        self.setup_stopwatch_tab()
+        self.multi_frame = ctk.CTkFrame(self.notebook)
+        self.notebook.add(self.multi_frame, text="⏲️ Múltiples")
+        self.alarm_frame = ctk.CTkFrame(self.notebook)
+        self.notebook.add(self.alarm_frame, text="🔔 Alarmas")
+        self.tab_builders = {
+            str(self.stopwatch_frame): self.build_stopwatch_tab,
+            str(self.multi_frame): self.build_multi_timer_tab,
+            str(self.alarm_frame): self.build_alarm_tab,
+        }
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
         
         # Botón para minimizar
         minimize_btn = ctk.CTkButton(
             self.root,
             text="📥 Minimizar al Tray",
             command=self.minimize_to_tray,
-            fg_color="orange",
-            hover_color="darkorange",
+            **styles.button("tray"),
             height=22,
             width=120
         )
         minimize_btn.pack(pady=2)
     
+    def on_tab_changed(self, event=None):
+        """Construye la pestaña seleccionada si todavía no existe"""
+        builder = self.tab_builders.pop(self.notebook.select(), None)
+        if builder is not None:
+            builder()
+    
+    def build_stopwatch_tab(self):
+        """Construye la pestaña del cronómetro y la pone al día con el núcleo"""
+        self.setup_stopwatch_tab()
+        self.sync_stopwatch_view()
+    
+    def build_multi_timer_tab(self):
+        """Construye la pestaña de temporizadores múltiples y la pone al día"""
+        self.setup_multi_timer_tab()
+        self.update_multi_timer_list()
+    
+    def build_alarm_tab(self):
+        """Construye la pestaña de alarmas y la pone al día"""
+        self.setup_alarm_tab()
+        self.update_alarm_list()
+    
     def setup_timer_tab(self):
         """Configura la pestaña del temporizador"""
         # Frame para entrada de tiempo
@@ -93,35 +460,40 @@ class TimerApp:
         # Horas
         hours_frame = ctk.CTkFrame(time_controls_frame)
         hours_frame.pack(side="left", padx=5)
-        ctk.CTkLabel(hours_frame, text="Horas").pack()
+        ctk.CTkLabel(hours_frame, text="Horas", font=styles.font("body")).pack()
         self.hours_var = tk.StringVar(value="0")
-        self.hours_spinbox = ctk.CTkEntry(hours_frame, textvariable=self.hours_var, width=60)
+        self.hours_spinbox = ctk.CTkEntry(hours_frame, textvariable=self.hours_var, font=styles.font("body"), width=60)
         self.hours_spinbox.pack(pady=5)
         
         # Minutos
         minutes_frame = ctk.CTkFrame(time_controls_frame)
         minutes_frame.pack(side="left", padx=5)
-        ctk.CTkLabel(minutes_frame, text="Minutos").pack()
+        ctk.CTkLabel(minutes_frame, text="Minutos", font=styles.font("body")).pack()
         self.minutes_var = tk.StringVar(value="0")
-        self.minutes_spinbox = ctk.CTkEntry(minutes_frame, textvariable=self.minutes_var, width=60)
+        self.minutes_spinbox = ctk.CTkEntry(minutes_frame, textvariable=self.minutes_var, font=styles.font("body"), width=60)
         self.minutes_spinbox.pack(pady=5)
         
         # Segundos
         seconds_frame = ctk.CTkFrame(time_controls_frame)
         seconds_frame.pack(side="left", padx=5)
-        ctk.CTkLabel(seconds_frame, text="Segundos").pack()
+        ctk.CTkLabel(seconds_frame, text="Segundos", font=styles.font("body")).pack()
         self.seconds_var = tk.StringVar(value="0")
-        self.seconds_spinbox = ctk.CTkEntry(seconds_frame, textvariable=self.seconds_var, width=60)
+        self.seconds_spinbox = ctk.CTkEntry(seconds_frame, textvariable=self.seconds_var, font=styles.font("body"), width=60)
         self.seconds_spinbox.pack(pady=5)
         
         # Display del tiempo restante
         self.timer_display = ctk.CTkLabel(
             self.timer_frame,
             text="00:00:00",
-            font=ctk.CTkFont(size=28, weight="bold"),
+            font=styles.font("display"),
             text_color="lime"
         )
         self.timer_display.pack(pady=3)
+        self.timer_label = CachedLabel(self.timer_display, self.probe, "timer")
+        
+        # Fase del programa de intervalos (se muestra solo con un programa en curso)
+        self.phase_display = ctk.CTkLabel(self.timer_frame, text="", font=styles.font("small"), height=16)
+        self.phase_label = CachedLabel(self.phase_display, self.probe, "phase")
         
         # Botones de control
         buttons_frame = ctk.CTkFrame(self.timer_frame)
@@ -131,8 +503,7 @@ class TimerApp:
             buttons_frame,
             text="▶️ Iniciar",
             command=self.start_timer,
-            fg_color="green",
-            hover_color="darkgreen",
+            **styles.button("start"),
             height=28,
             width=80
         )
@@ -142,8 +513,7 @@ class TimerApp:
             buttons_frame,
             text="⏸️ Pausar",
             command=self.pause_timer,
-            fg_color="orange",
-            hover_color="darkorange",
+            **styles.button("pause"),
             state="disabled",
             height=28,
             width=80
@@ -154,8 +524,7 @@ class TimerApp:
             buttons_frame,
             text="🔄 Reiniciar",
             command=self.reset_timer,
-            fg_color="red",
-            hover_color="darkred",
+            **styles.button("reset"),
             height=28,
             width=80
         )
@@ -165,17 +534,32 @@ class TimerApp:
         presets_frame = ctk.CTkFrame(self.timer_frame)
         presets_frame.pack(pady=2)
         
-        ctk.CTkLabel(presets_frame, text="Presets:", font=ctk.CTkFont(size=11)).pack(pady=2)
+        presets_header = ctk.CTkFrame(presets_frame, fg_color="transparent")
+        presets_header.pack(pady=2)
+        ctk.CTkLabel(presets_header, text="Presets:", font=styles.font("small")).pack(side="left", padx=3)
+        
+        # Programas de intervalos (Pomodoro, HIIT...): elegir uno lo arranca
+        self.program_menu = ctk.CTkOptionMenu(
+            presets_header,
+            values=list(self.programs),
+            command=self.start_program,
+            font=styles.font("small"),
+            dropdown_font=styles.font("small"),
+            height=20,
+            width=130
+        )
+        self.program_menu.set(PROGRAM_MENU_TEXT)
+        self.program_menu.pack(side="left", padx=3)
         
         presets_buttons_frame = ctk.CTkFrame(presets_frame)
         presets_buttons_frame.pack(pady=2)
         
-        preset_times = [("5 min", 5), ("10 min", 10), ("15 min", 15), ("30 min", 30), ("1 hora", 60)]
-        for text, minutes in preset_times:
+        for text, minutes in config.TIMER_PRESETS:
             btn = ctk.CTkButton(
                 presets_buttons_frame,
                 text=text,
                 command=lambda m=minutes: self.set_preset_time(m),
+                **styles.button("primary"),
                 width=55,
                 height=24
             )
@@ -188,13 +572,31 @@ class TimerApp:
         main_stopwatch_frame.pack(fill="both", expand=True, padx=5, pady=3)
         
         # Display del cronómetro (más compacto)
-        self.stopwatch_display = ctk.CTkLabel(
-            main_stopwatch_frame,
-            text="00:00:00.0",
-            font=ctk.CTkFont(size=28, weight="bold"),
-            text_color="cyan"
-        )
+        if config.CANVAS_CLOCK:
+            from canvas_clock import GlyphClock
+            
+            # Un canvas no sigue el tema: se le da el color de fondo del frame
+            bg = main_stopwatch_frame._apply_appearance_mode(main_stopwatch_frame.cget("fg_color"))
+            self.stopwatch_display = GlyphClock(
+                main_stopwatch_frame,
+                size=36,
+                color="cyan",
+                bg=bg,
+                text=self.stopwatch_format(0),
+                probe=self.probe,
+                name="stopwatch"
+            )
+            self.stopwatch_label = self.stopwatch_display
+        else:
+            self.stopwatch_display = ctk.CTkLabel(
+                main_stopwatch_frame,
+                text=self.stopwatch_format(0),
+                font=styles.font("display"),
+                text_color="cyan"
+            )
+            self.stopwatch_label = CachedLabel(self.stopwatch_display, self.probe, "stopwatch")
         self.stopwatch_display.pack(pady=3)
+        self.stopwatch_display.bind("<Button-1>", self.cycle_stopwatch_mode)
         
         # Botones de control (más compactos)
         buttons_frame = ctk.CTkFrame(main_stopwatch_frame)
@@ -204,8 +606,7 @@ class TimerApp:
             buttons_frame,
             text="▶️ Iniciar",
             command=self.start_stopwatch,
-            fg_color="green",
-            hover_color="darkgreen",
+            **styles.button("start"),
             height=28,
             width=80
         )
@@ -215,8 +616,7 @@ class TimerApp:
             buttons_frame,
             text="⏸️ Pausar",
             command=self.pause_stopwatch,
-            fg_color="orange",
-            hover_color="darkorange",
+            **styles.button("pause"),
             state="disabled",
             height=28,
             width=80
@@ -227,37 +627,120 @@ class TimerApp:
             buttons_frame,
             text="🔄 Reiniciar",
             command=self.reset_stopwatch,
-            fg_color="red",
-            hover_color="darkred",
+            **styles.button("reset"),
             height=28,
             width=80
         )
         self.reset_stopwatch_btn.pack(side="left", padx=2)
         
-        # Botón para marcar vuelta (más compacto)
+        # Botones de vuelta y exportación (más compactos)
+        lap_buttons_frame = ctk.CTkFrame(main_stopwatch_frame)
+        lap_buttons_frame.pack(pady=1)
+        
         self.lap_btn = ctk.CTkButton(
-            main_stopwatch_frame,
+            lap_buttons_frame,
             text="🏁 Marcar Vuelta",
-            command=self.mark_lap,
-            fg_color="purple",
-            hover_color="darkpurple",
+            **styles.button("lap"),
             state="disabled",
             height=22,
             width=100
         )
-        self.lap_btn.pack(pady=1)
+        self.lap_btn.pack(side="left", padx=2)
+        # La vuelta se toma al presionar (no al soltar) y con el instante del evento
+        self.lap_btn.bind("<Button-1>", self.on_lap_press)
+        
+        self.export_btn = ctk.CTkButton(
+            lap_buttons_frame,
+            text="💾 Exportar",
+            command=self.toggle_export,
+            font=styles.font("body"),
+            height=22,
+            width=100
+        )
+        self.export_btn.pack(side="left", padx=2)
         
         # Lista de vueltas (más compacta)
         laps_frame = ctk.CTkFrame(main_stopwatch_frame)
         laps_frame.pack(fill="both", expand=True, padx=5, pady=1)
         
-        ctk.CTkLabel(laps_frame, text="Vueltas:", font=ctk.CTkFont(size=11)).pack(pady=1)
+        ctk.CTkLabel(laps_frame, text="Vueltas:", font=styles.font("small")).pack(pady=1)
         
-        # Scrollable frame para las vueltas (más compacto)
-        self.laps_container = ctk.CTkScrollableFrame(laps_frame, height=60)
-        self.laps_container.pack(fill="both", expand=True, padx=3, pady=1)
+        # Lista virtualizada: los widgets no crecen con la cantidad de vueltas
+        self.laps_view = LapListView(laps_frame, self.lap_row_text)
+        self.laps_view.pack(fill="both", expand=True, padx=3, pady=1)
         
-        self.laps = []
+        # Estadísticas de los parciales (se actualizan en O(1) por vuelta)
+        self.lap_stats_label = ctk.CTkLabel(laps_frame, text="", font=styles.font("small"), height=16)
+        self.lap_stats_label.pack(pady=0)
+    
+    def setup_multi_timer_tab(self):
+        """Configura la pestaña de temporizadores múltiples"""
+        # Entrada de nombre y minutos
+        input_frame = ctk.CTkFrame(self.multi_frame)
+        input_frame.pack(pady=3)
+        
+        self.multi_name_entry = ctk.CTkEntry(input_frame, placeholder_text="Nombre", font=styles.font("body"), width=160)
+        self.multi_name_entry.pack(side="left", padx=3)
+        
+        self.multi_minutes_entry = ctk.CTkEntry(input_frame, placeholder_text="Min", font=styles.font("body"), width=60)
+        self.multi_minutes_entry.pack(side="left", padx=3)
+        
+        ctk.CTkButton(
+            input_frame,
+            text="➕ Añadir",
+            command=self.add_multi_timer,
+            **styles.button("start"),
+            height=28,
+            width=80
+        ).pack(side="left", padx=3)
+        
+        # Filas fijas con los temporizadores más próximos
+        self.multi_list = FixedRowList(
+            self.multi_frame,
+            self.multi_row_text,
+            self.cancel_multi_timer,
+            "Sin temporizadores",
+            "{} activos",
+            MULTI_TIMER_ROWS,
+            probe=self.probe,
+            name="multi_timers"
+        )
+        self.multi_list.pack(fill="x")
+    
+    def setup_alarm_tab(self):
+        """Configura la pestaña de alarmas"""
+        # Entrada de la hora (o regla de cron) y el nombre
+        input_frame = ctk.CTkFrame(self.alarm_frame)
+        input_frame.pack(pady=3)
+        
+        self.alarm_spec_entry = ctk.CTkEntry(input_frame, placeholder_text="07:30 o 30 7 * * 1-5",
+                                             font=styles.font("body"), width=150)
+        self.alarm_spec_entry.pack(side="left", padx=3)
+        
+        self.alarm_name_entry = ctk.CTkEntry(input_frame, placeholder_text="Nombre", font=styles.font("body"), width=120)
+        self.alarm_name_entry.pack(side="left", padx=3)
+        
+        ctk.CTkButton(
+            input_frame,
+            text="➕ Añadir",
+            command=self.add_alarm,
+            **styles.button("start"),
+            height=28,
+            width=80
+        ).pack(side="left", padx=3)
+        
+        # Filas fijas con las alarmas más próximas
+        self.alarm_list = FixedRowList(
+            self.alarm_frame,
+            self.alarm_row_text,
+            self.cancel_alarm,
+            "Sin alarmas",
+            "{} alarmas",
+            ALARM_ROWS,
+            probe=self.probe,
+            name="alarms"
+        )
+        self.alarm_list.pack(fill="x")
     
     def set_preset_time(self, minutes):
         """Establece un tiempo predefinido"""
@@ -267,6 +750,12 @@ class TimerApp:
     
     def start_timer(self):
         """Inicia el temporizador"""
+        # Si estaba en pausa se continúa desde la misma fecha límite
+        if self.timer.paused:
+            self.timer.resume()
+            self.on_timer_started()
+            return
+        
         try:
             hours = int(self.hours_var.get() or "0")
             minutes = int(self.minutes_var.get() or "0")
@@ -278,156 +767,790 @@ class TimerApp:
                 messagebox.showwarning("Advertencia", "Por favor ingresa un tiempo válido")
                 return
             
-            self.timer_seconds = total_seconds
-            self.timer_running = True
-            
-            self.start_timer_btn.configure(state="disabled")
-            self.pause_timer_btn.configure(state="normal")
-            
-            self.timer_thread = threading.Thread(target=self.timer_countdown, daemon=True)
-            self.timer_thread.start()
+            self.program = None
+            self.timer.start(total_seconds)
+            self.on_timer_started()
             
         except ValueError:
             messagebox.showerror("Error", "Por favor ingresa valores numéricos válidos")
     
-    def timer_countdown(self):
-        """Cuenta regresiva del temporizador"""
-        while self.timer_running and self.timer_seconds > 0:
-            time.sleep(1)
-            self.timer_seconds -= 1
-            
-            # Actualizar display en el hilo principal
-            self.root.after(0, self.update_timer_display)
-            
-            if self.timer_seconds <= 0:
-                self.root.after(0, self.timer_finished)
-                break
+    def on_timer_started(self):
+        """Refleja en la vista que el temporizador está corriendo"""
+        self.sync_timer_view()
+        self.schedule_timer_tick()
+        self.save_timer_state()
     
-    def update_timer_display(self):
-        """Actualiza el display del temporizador"""
-        hours = self.timer_seconds // 3600
-        minutes = (self.timer_seconds % 3600) // 60
-        seconds = self.timer_seconds % 60
+    def sync_timer_view(self):
+        """Lleva la pestaña del temporizador al estado del núcleo (si la vista existe)"""
+        if self.timer_label is None:
+            return
+        running = self.timer.running
+        self.start_timer_btn.configure(
+            state="disabled" if running else "normal",
+            text="▶️ Continuar" if self.timer.paused else "▶️ Iniciar"
+        )
+        self.pause_timer_btn.configure(state="normal" if running else "disabled")
         
-        time_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-        self.timer_display.configure(text=time_str)
+        if self.program is not None and self.timer.state != IDLE:
+            self.program_menu.set(self.program.name)
+            self.phase_label.key = None
+            self.phase_display.pack(after=self.timer_display)
+        else:
+            self.program_menu.set(PROGRAM_MENU_TEXT)
+            self.phase_display.pack_forget()
+        self.update_timer_display()
+    
+    def schedule_timer_tick(self):
+        """Programa el próximo tick justo en el siguiente límite de segundo entero"""
+        self.scheduler.cancel(self.timer_job)
+        delay = timer_tick_delay(self.timer, self.program, self.is_minimized)
+        self.timer_job = self.scheduler.call_later(delay, self.timer_countdown)
+    
+    def timer_phase(self):
+        """(índice, nombre, restante) de la fase en curso, o None sin programa"""
+        return timer_phase(self.timer, self.program)
+    
+    def timer_display_seconds(self):
+        """Segundos a mostrar: los de la fase en curso si corre un programa"""
+        phase = self.timer_phase()
+        if phase is None:
+            return self.timer.remaining_seconds()
+        return math.ceil(phase[2])
+    
+    def timer_countdown(self):
+        """Tick de la cuenta regresiva del temporizador"""
+        self.timer_job = None
+        if not self.timer.running:
+            return
+        
+        if not self.is_minimized:
+            self.update_timer_display()
         
-        # Cambiar color según tiempo restante
-        if self.timer_seconds <= 10:
-            self.timer_display.configure(text_color="red")
-        elif self.timer_seconds <= 30:
-            self.timer_display.configure(text_color="orange")
+        if self.timer.expired():
+            self.timer_finished()
+        else:
+            self.check_program_phase()
+            self.schedule_timer_tick()
+    
+    def update_timer_display(self):
+        """Actualiza el display del temporizador (solo si cambió el segundo o el color)"""
+        if self.timer_label is None:
+            return
+        if self.timer.state == IDLE:
+            self.timer_label.show("00:00:00", "lime")
+            return
+        remaining = self.timer_display_seconds()
+        self.timer_label.show_key(remaining, format_hms, self.timer_color(remaining))
+        if self.program is not None:
+            self.phase_label.show_key(self.timer_phase()[0], self.phase_text)
+    
+    def phase_text(self, index):
+        """Texto de la fase número `index` del programa en curso"""
+        return f"{self.program.phase_name(index)} · {index + 1}/{len(self.program)}"
+    
+    def check_program_phase(self):
+        """Avisa el fin de fase una sola vez, aunque se hayan saltado varias (suspensión)"""
+        phase = self.timer_phase()
+        if phase is None or phase[0] == self.program_phase:
+            return
+        self.program_phase = phase[0]
+        finished = self.program.phase_name(phase[0] - 1)
+        self.notifier.notify(f"{finished} → {phase[1]}")
+    
+    def timer_color(self, remaining):
+        """Color del temporizador según el tiempo restante"""
+        if remaining <= 10:
+            return "red"
+        elif remaining <= 30:
+            return "orange"
+        return "lime"
     
     def timer_finished(self):
         """Se ejecuta cuando el temporizador termina"""
-        self.timer_running = False
-        self.timer_display.configure(text="00:00:00", text_color="lime")
-        self.start_timer_btn.configure(state="normal")
-        self.pause_timer_btn.configure(state="disabled")
+        name = self.program.name if self.program is not None else "Temporizador"
+        self.program = None
+        self.timer.reset()
+        self.save_timer_state()
+        self.sync_timer_view()
         
-        # Notificación
-        messagebox.showinfo("Temporizador", "¡Tiempo completado!")
-        
-        # Hacer parpadear la ventana
-        self.root.lift()
-        self.root.focus_force()
+        # Aviso no bloqueante: los relojes siguen actualizándose
+        self.notifier.notify(name)
     
     def pause_timer(self):
         """Pausa el temporizador"""
-        self.timer_running = False
-        self.start_timer_btn.configure(state="normal", text="▶️ Continuar")
-        self.pause_timer_btn.configure(state="disabled")
+        self.timer.pause()
+        self.scheduler.cancel(self.timer_job)
+        self.timer_job = None
+        self.save_timer_state()
+        self.sync_timer_view()
     
     def reset_timer(self):
         """Reinicia el temporizador"""
-        self.timer_running = False
-        self.timer_seconds = 0
-        self.timer_display.configure(text="00:00:00", text_color="lime")
-        self.start_timer_btn.configure(state="normal", text="▶️ Iniciar")
-        self.pause_timer_btn.configure(state="disabled")
+        self.program = None
+        self.timer.reset()
+        self.scheduler.cancel(self.timer_job)
+        self.timer_job = None
+        self.save_timer_state()
+        self.sync_timer_view()
     
     def start_stopwatch(self):
-        """Inicia el cronómetro"""
-        self.stopwatch_running = True
-        self.start_stopwatch_btn.configure(state="disabled")
-        self.pause_stopwatch_btn.configure(state="normal")
-        self.lap_btn.configure(state="normal")
+        """Inicia (o continúa) el cronómetro"""
+        self.stopwatch.start()
+        self.on_stopwatch_started()
+        self.save_stopwatch_state()
+        self.export_event("start")
+    
+    def on_stopwatch_started(self):
+        """Refleja en la vista que el cronómetro está corriendo"""
+        self.sync_stopwatch_view()
+    
+    def sync_stopwatch_view(self):
+        """Lleva la pestaña del cronómetro al estado del núcleo (si ya se construyó)"""
+        self.scheduler.cancel(self.stopwatch_job)
+        self.stopwatch_job = None
+        if self.stopwatch_label is None:
+            return
+        
+        running = self.stopwatch.running
+        self.start_stopwatch_btn.configure(
+            state="disabled" if running else "normal",
+            text="▶️ Continuar" if self.stopwatch.paused else "▶️ Iniciar"
+        )
+        self.pause_stopwatch_btn.configure(state="normal" if running else "disabled")
+        self.lap_btn.configure(state="normal" if running else "disabled")
+        self.export_btn.configure(text="💾 Exportar" if self.lap_exporter is None else "⏹️ Exportando")
         
-        self.stopwatch_thread = threading.Thread(target=self.stopwatch_count, daemon=True)
-        self.stopwatch_thread.start()
+        if len(self.stopwatch.laps):
+            self.laps_view.set_count(len(self.stopwatch.laps))
+        else:
+            self.laps_view.clear()
+        self.update_lap_stats()
+        self.update_stopwatch_display()
+        self.stopwatch_count()
     
     def stopwatch_count(self):
-        """Cuenta del cronómetro"""
-        start_time = time.time()
-        while self.stopwatch_running:
-            elapsed = time.time() - start_time
-            self.stopwatch_seconds = elapsed
-            
-            # Actualizar display en el hilo principal
-            self.root.after(0, self.update_stopwatch_display)
-            time.sleep(0.1)
+        """Tick del cronómetro (cada décima, o cada cuadro con el reloj de glifos)"""
+        self.stopwatch_job = None
+        if not self.stopwatch.running or self.is_minimized or self.stopwatch_label is None:
+            # Oculto o sin construir: el tiempo se recalcula al mostrarse
+            return
+        
+        elapsed_ns = self.stopwatch.elapsed_ns()
+        self.update_stopwatch_display(elapsed_ns)
+        
+        # Despertar en el próximo límite de paso en lugar de dormir un intervalo fijo
+        delay = stopwatch_tick_delay(elapsed_ns, self.stopwatch_step)
+        self.stopwatch_job = self.scheduler.call_later(delay, self.stopwatch_count)
     
-    def update_stopwatch_display(self):
-        """Actualiza el display del cronómetro"""
-        hours = int(self.stopwatch_seconds // 3600)
-        minutes = int((self.stopwatch_seconds % 3600) // 60)
-        seconds = int(self.stopwatch_seconds % 60)
-        tenths = int((self.stopwatch_seconds * 10) % 10)
+    def update_stopwatch_display(self, elapsed_ns=None):
+        """Actualiza el display del cronómetro (solo si cambió el dígito menor)"""
+        if self.stopwatch_label is None:
+            return
+        if elapsed_ns is None:
+            elapsed_ns = self.stopwatch.elapsed_ns()
+        self.stopwatch_label.show_key(elapsed_ns // self.stopwatch_unit_ns, self.stopwatch_format)
+    
+    def set_stopwatch_mode(self, mode):
+        """Muestra el cronómetro en décimas, centésimas o milésimas"""
+        self.stopwatch_mode = mode
+        self.stopwatch_scale, self.stopwatch_decimals, self.stopwatch_format = STOPWATCH_MODES[mode]
+        self.stopwatch_unit_ns = 10 ** 9 // self.stopwatch_scale
+        # Más fino que una décima: un tick por cuadro de pantalla
+        self.stopwatch_step = stopwatch_step(self.stopwatch_scale, config.CLOCK_FPS)
         
-        time_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}.{tenths}"
-        self.stopwatch_display.configure(text=time_str)
+        # La misma clave con otra escala no debe reutilizar el texto anterior
+        if self.presentation_clock is not None:
+            self.presentation_clock.key = None
+        if self.stopwatch_label is not None:
+            self.stopwatch_label.key = None
+            self.sync_stopwatch_view()
+    
+    def cycle_stopwatch_mode(self, event=None):
+        """Pasa al siguiente modo del display (clic en el display)"""
+        modes = list(STOPWATCH_MODES)
+        self.set_stopwatch_mode(modes[(modes.index(self.stopwatch_mode) + 1) % len(modes)])
     
     def pause_stopwatch(self):
         """Pausa el cronómetro"""
-        self.stopwatch_running = False
-        self.start_stopwatch_btn.configure(state="normal", text="▶️ Continuar")
-        self.pause_stopwatch_btn.configure(state="disabled")
+        self.stopwatch.pause()
+        self.sync_stopwatch_view()
+        self.save_stopwatch_state()
+        self.export_event("pause", cumulative=self.stopwatch.elapsed())
     
     def reset_stopwatch(self):
         """Reinicia el cronómetro"""
-        self.stopwatch_running = False
-        self.stopwatch_seconds = 0
-        self.stopwatch_display.configure(text="00:00:00.0")
-        self.start_stopwatch_btn.configure(state="normal", text="▶️ Iniciar")
-        self.pause_stopwatch_btn.configure(state="disabled")
-        self.lap_btn.configure(state="disabled")
-        
-        # Limpiar vueltas
-        for widget in self.laps_container.winfo_children():
-            widget.destroy()
-        self.laps = []
-    
-    def mark_lap(self):
-        """Marca una vuelta en el cronómetro"""
-        if self.stopwatch_running:
-            lap_time = self.stopwatch_seconds
-            self.laps.append(lap_time)
-            
-            # Crear label para la vuelta
-            lap_text = f"Vuelta {len(self.laps)}: {self.format_time(lap_time)}"
-            lap_label = ctk.CTkLabel(self.laps_container, text=lap_text)
-            lap_label.pack(anchor="w", pady=2)
+        self.stopwatch.reset()
+        self.sync_stopwatch_view()
+        self.save_stopwatch_state()
+        self.export_event("reset")
+    
+    def on_lap_press(self, event):
+        """Toma el instante al presionar el botón de vuelta, antes que nada"""
+        at = self.stopwatch.clock()
+        self.mark_lap(at)
+    
+    def mark_lap(self, at=None):
+        """Marca una vuelta en el cronómetro (en el instante `at` del reloj, o ahora)"""
+        lap = self.stopwatch.lap(at)
+        if lap is not None:
+            if self.laps_view is not None:
+                self.laps_view.set_count(len(self.stopwatch.laps))
+                self.update_lap_stats()
+            self.export_event("lap", *lap)
+            # Una vuelta es un cambio de estado: se guarda para que sobreviva a un cierre
+            self.save_stopwatch_state()
+    
+    def lap_row_text(self, index):
+        """Texto de la fila de una vuelta"""
+        laps = self.stopwatch.laps
+        cumulative = format_short(laps.cumulative[index], self.stopwatch_decimals)
+        split = format_short(laps.splits[index], self.stopwatch_decimals)
+        return f"Vuelta {index + 1}: {cumulative}  (+{split})"
+    
+    def update_lap_stats(self):
+        """Muestra mejor, peor, media y desviación de los parciales"""
+        laps = self.stopwatch.laps
+        if not len(laps):
+            self.lap_stats_label.configure(text="")
+            return
+        
+        self.lap_stats_label.configure(
+            text=f"Mejor {format_short(laps.best, self.stopwatch_decimals)} · "
+                 f"Peor {format_short(laps.worst, self.stopwatch_decimals)} · "
+                 f"Media {format_short(laps.mean, self.stopwatch_decimals)} · "
+                 f"σ {laps.stddev:.2f}s"
+        )
+    
+    def save_timer_state(self):
+        """Registra el estado del temporizador (solo en cambios, nunca por tick)"""
+        state = self.timer.snapshot()
+        if state is not None and self.timer.running:
+            state.update(anchor())
+        if state is not None and self.program is not None:
+            state["program"] = self.program.name
+        self.journal.record("timer", state)
+        self.publish_state()
+    
+    def save_stopwatch_state(self):
+        """Registra el estado del cronómetro (solo en cambios, nunca por tick)"""
+        state = self.stopwatch.snapshot()
+        if state is not None and self.stopwatch.running:
+            state.update(anchor())
+        self.journal.record("stopwatch", state)
+        self.publish_state()
+    
+    def restore_state(self):
+        """Restaura los relojes desde el diario, donde estarían ahora"""
+        state = self.journal.load()
+        
+        timer = state.get("timer")
+        if timer:
+            if timer["state"] == "running":
+                # Si terminó mientras la app estaba cerrada, el primer tick lo avisa
+                timer = dict(timer, remaining=max(0.0, timer["remaining"] - elapsed_since(timer)))
+            self.timer.restore(timer)
+            self.program = self.programs.get(timer.get("program"))
+            if self.program is not None:
+                # Las fases vencidas con la app cerrada no se vuelven a avisar
+                self.program_phase = self.timer_phase()[0]
+            if self.timer.running:
+                self.on_timer_started()
+            else:
+                self.sync_timer_view()
+        
+        stopwatch = state.get("stopwatch")
+        if stopwatch:
+            if stopwatch["state"] == "running":
+                stopwatch = dict(stopwatch, elapsed=stopwatch["elapsed"] + elapsed_since(stopwatch))
+            self.stopwatch.restore(stopwatch)
+            self.sync_stopwatch_view()
+        
+        for key, value in state.items():
+            if key.startswith("multi:"):
+                name = key[len("multi:"):]
+                try:
+                    self.multi_timers.add(name, value["remaining"] - elapsed_since(value))
+                except (KeyError, TypeError, ValueError):
+                    # Registro dañado (o un Infinity de versiones anteriores)
+                    self.journal.record(key, None)
+        if len(self.multi_timers):
+            self.arm_multi_timers()
+            self.update_multi_timer_list()
+        
+        # Las alarmas vuelven con su próximo disparo guardado: si pasó con la app
+        # cerrada, la primera comprobación la hace sonar o la informa como perdida
+        for key, value in state.items():
+            if key.startswith("alarm:"):
+                try:
+                    self.alarms.restore(key[len("alarm:"):], value)
+                except (KeyError, ValueError):
+                    self.journal.record(key, None)
+        if len(self.alarms):
+            self.arm_alarms()
+            self.update_alarm_list()
+    
+    def post(self, function, *args):
+        """Encola una llamada desde cualquier hilo; un solo after drena todo lo pendiente"""
+        self.inbox.append((function, args))
+        self.schedule_drain(0)
+    
+    def schedule_drain(self, delay_ms):
+        with self.inbox_lock:
+            if self.inbox_pending:
+                return
+            self.inbox_pending = True
+        self.root.after(delay_ms, self.drain_inbox)
+    
+    def drain_inbox(self):
+        """Ejecuta en el hilo principal las llamadas encoladas, con un límite de tiempo"""
+        with self.inbox_lock:
+            self.inbox_pending = False
+        deadline = time.perf_counter() + INBOX_BUDGET
+        while self.inbox:
+            function, args = self.inbox.popleft()
+            function(*args)
+            if self.inbox and time.perf_counter() > deadline:
+                # Ceder el bucle (redibujos, eventos) y seguir en la próxima vuelta
+                self.schedule_drain(1)
+                return
+    
+    def post_command(self, command):
+        """Encola un comando de línea de comandos (desde el hilo de instancia única)"""
+        self.post(self.run_command, command)
+    
+    def run_command(self, command):
+        """Aplica un comando de línea de comandos ({"start": segundos, "show": bool})"""
+        if command.get("start"):
+            self.start_timer_for(command["start"])
+        if command.get("show"):
+            self._show_window()
+        elif self.is_minimized:
+            # El tooltip del tray refleja el cambio sin esperar al próximo refresco
+            self.scheduler.cancel(self.tray_refresh_job)
+            self.refresh_tray()
+    
+    def start_control_api(self):
+        """Arranca la API local de control (asyncio en su propio hilo)"""
+        from control_api import ControlServer
+        
+        self.control = ControlServer(lambda batch, done: self.post(self.run_control_batch, batch, done))
+        if not self.control.start():
+            self.control = None
+            return
+        self.publish_state()
+    
+    def publish_state(self):
+        """Publica el estado que responden las consultas de la API de control"""
+        if self.control is not None:
+            self.control.publish(dict(self.control_state(), at=time.monotonic()))
+    
+    def control_state(self):
+        """Estado actual de los relojes como diccionario serializable"""
+        return {
+            "timer": {
+                "state": self.timer.state,
+                "remaining": self.timer.remaining(),
+                "duration": self.timer.duration,
+                "program": self.program.name if self.program is not None else None,
+            },
+            "stopwatch": {
+                "state": self.stopwatch.state,
+                "elapsed": self.stopwatch.elapsed(),
+                "laps": len(self.stopwatch.laps),
+            },
+            "multi_timers": len(self.multi_timers),
+            "alarms": len(self.alarms),
+        }
+    
+    def run_control_batch(self, batch, done):
+        """Ejecuta en orden un lote de la API de control y entrega los resultados"""
+        results = []
+        try:
+            for command in batch:
+                try:
+                    results.append(self.run_control(command))
+                except Exception as e:
+                    # Un comando que falla no corta el lote ni deja al cliente esperando
+                    results.append({"ok": False, "error": str(e) or type(e).__name__})
+            self.publish_state()
+            if self.is_minimized:
+                self.scheduler.cancel(self.tray_refresh_job)
+                self.refresh_tray()
+        finally:
+            results.extend({"ok": False, "error": "lote interrumpido"} for _ in batch[len(results):])
+            done(results)
+    
+    def run_control(self, command):
+        """Ejecuta un comando de la API de control"""
+        name = command["cmd"]
+        if name == "query":
+            return {"ok": True, "state": self.control_state()}
+        
+        if name == "timer.start":
+            if command.get("seconds") is not None:
+                seconds = float(command["seconds"])
+                if not math.isfinite(seconds) or seconds <= 0:
+                    raise ValueError("seconds debe ser un número positivo y finito")
+                self.start_timer_for(seconds)
+            elif self.timer.paused:
+                self.start_timer()
+            elif not self.timer.running:
+                raise ValueError("falta seconds")
+        elif name == "timer.program":
+            if command.get("name") not in self.programs:
+                raise ValueError("programa desconocido")
+            self.start_program(command["name"])
+        elif name == "timer.pause":
+            if self.timer.running:
+                self.pause_timer()
+        elif name == "timer.reset":
+            self.reset_timer()
+        elif name == "stopwatch.start":
+            if not self.stopwatch.running:
+                self.start_stopwatch()
+        elif name == "stopwatch.pause":
+            if self.stopwatch.running:
+                self.pause_stopwatch()
+        elif name == "stopwatch.reset":
+            self.reset_stopwatch()
+        elif name == "stopwatch.lap":
+            if not self.stopwatch.running:
+                raise ValueError("el cronómetro no está corriendo")
+            self.mark_lap()
+            return {"ok": True, "lap": len(self.stopwatch.laps)}
+        elif name == "show":
+            self._show_window()
+        return {"ok": True}
+    
+    def start_timer_for(self, seconds, program=None):
+        """Arranca una cuenta regresiva nueva de `seconds` segundos (o de un programa)"""
+        self.scheduler.cancel(self.timer_job)
+        self.timer_job = None
+        self.program = program
+        self.program_phase = 0
+        self.timer.start(seconds)
+        self.update_timer_display()
+        self.on_timer_started()
+    
+    def start_program(self, name):
+        """Arranca el programa de intervalos `name` desde su primera fase"""
+        program = self.programs[name]
+        self.start_timer_for(program.total, program)
+    
+    def toggle_export(self):
+        """Empieza o detiene la exportación continua de vueltas"""
+        if self.lap_exporter is not None:
+            self.stop_export()
+            return
+        
+        path = filedialog.asksaveasfilename(
+            title="Exportar vueltas",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl")],
+            confirmoverwrite=False
+        )
+        if not path:
+            return
+        
+        try:
+            self.lap_exporter = LapExporter(path)
+        except OSError as e:
+            messagebox.showerror("Error", f"No se pudo abrir el archivo:\n{e}")
+            return
+        
+        # Volcar las vueltas que ya existían; el buffer escribe por lotes
+        self.export_event("export")
+        laps = self.stopwatch.laps
+        for index in range(len(laps)):
+            self.export_event("lap", index + 1, laps.cumulative[index], laps.splits[index])
+        self.export_btn.configure(text="⏹️ Exportando")
+    
+    def stop_export(self):
+        """Cierra el archivo de exportación escribiendo lo pendiente"""
+        self.scheduler.cancel(self.export_flush_job)
+        self.export_flush_job = None
+        if self.lap_exporter is not None:
+            try:
+                self.lap_exporter.close()
+            except OSError:
+                pass
+            self.lap_exporter = None
+        if self.export_btn is not None:
+            self.export_btn.configure(text="💾 Exportar")
+    
+    def export_event(self, event, lap=None, cumulative=None, split=None):
+        """Agrega un evento a la exportación activa (si hay una)"""
+        if self.lap_exporter is None:
+            return
+        try:
+            self.lap_exporter.write_event(event, lap, cumulative, split)
+        except OSError as e:
+            self.stop_export()
+            messagebox.showerror("Error", f"Se detuvo la exportación:\n{e}")
+            return
+        
+        # Una fila nunca espera en memoria más de FLUSH_INTERVAL segundos
+        if self.lap_exporter.pending and self.export_flush_job is None:
+            self.export_flush_job = self.scheduler.call_later(FLUSH_INTERVAL, self.flush_export)
+    
+    def flush_export(self):
+        """Escribe el lote pendiente de la exportación"""
+        self.export_flush_job = None
+        if self.lap_exporter is None:
+            return
+        try:
+            self.lap_exporter.flush()
+        except OSError as e:
+            self.stop_export()
+            messagebox.showerror("Error", f"Se detuvo la exportación:\n{e}")
     
     def format_time(self, seconds):
         """Formatea el tiempo para mostrar"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        tenths = int((seconds * 10) % 10)
+        return format_short(seconds)
+    
+    def free_name(self, prefix, count, taken):
+        """Primer nombre "prefijo N" con N > count que no esté en `taken`; devuelve (nombre, N)"""
+        while True:
+            count += 1
+            name = f"{prefix} {count}"
+            if name not in taken:
+                return name, count
+    
+    def add_multi_timer(self):
+        """Agrega un temporizador con nombre a la cola"""
+        try:
+            minutes = float(self.multi_minutes_entry.get())
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingresa valores numéricos válidos")
+            return
         
-        if hours > 0:
-            return f"{hours:02d}:{minutes:02d}:{secs:02d}.{tenths}"
-        else:
-            return f"{minutes:02d}:{secs:02d}.{tenths}"
+        if not math.isfinite(minutes) or minutes <= 0:
+            messagebox.showwarning("Advertencia", "Por favor ingresa un tiempo válido")
+            return
+        
+        name = self.multi_name_entry.get().strip()
+        if not name:
+            name, self.multi_timer_count = self.free_name("Temporizador", self.multi_timer_count,
+                                                          self.multi_timers)
+        elif name in self.multi_timers:
+            messagebox.showwarning("Advertencia", f'Ya hay un temporizador llamado "{name}"')
+            return
+        self.multi_timers.add(name, minutes * 60)
+        self.journal.record(f"multi:{name}", {"remaining": minutes * 60, **anchor()})
+        self.multi_name_entry.delete(0, "end")
+        self.arm_multi_timers()
+        self.update_multi_timer_list()
+        self.publish_state()
+    
+    def cancel_multi_timer(self, name):
+        """Cancela el temporizador con ese nombre"""
+        if self.multi_timers.cancel(name):
+            self.journal.record(f"multi:{name}", None)
+            self.arm_multi_timers()
+            self.update_multi_timer_list()
+            self.publish_state()
+    
+    def arm_multi_timers(self):
+        """Programa un único despertar para el vencimiento más próximo"""
+        self.scheduler.cancel(self.multi_timer_job)
+        self.multi_timer_job = None
+        deadline = self.multi_timers.next_deadline()
+        if deadline is not None:
+            self.multi_timer_job = self.scheduler.call_at(deadline, self.multi_timers_expired)
+    
+    def multi_timers_expired(self):
+        """Se ejecuta cuando vence el temporizador múltiple más próximo"""
+        self.multi_timer_job = None
+        expired = self.multi_timers.pop_expired()
+        self.arm_multi_timers()
+        if not expired:
+            return
+        for name in expired:
+            self.journal.record(f"multi:{name}", None)
+        self.publish_state()
+        
+        if not self.is_minimized:
+            self.update_multi_timer_list()
+        for name in expired:
+            self.notifier.notify(name)
+    
+    def add_alarm(self):
+        """Agrega una alarma única ("14:30") o recurrente (regla de cron)"""
+        name = self.alarm_name_entry.get().strip()
+        count = self.alarm_count
+        if not name:
+            name, count = self.free_name("Alarma", count, self.alarms)
+        elif name in self.alarms:
+            messagebox.showwarning("Advertencia", f'Ya hay una alarma llamada "{name}"')
+            return
+        try:
+            self.alarms.add(name, self.alarm_spec_entry.get())
+        except ValueError as e:
+            messagebox.showerror("Error", f"Hora no válida: {e}")
+            return
+        
+        self.alarm_count = count
+        self.save_alarm(name)
+        self.alarm_spec_entry.delete(0, "end")
+        self.alarm_name_entry.delete(0, "end")
+        self.arm_alarms()
+        self.update_alarm_list()
+        self.publish_state()
+    
+    def cancel_alarm(self, name):
+        """Cancela la alarma con ese nombre"""
+        if self.alarms.cancel(name):
+            self.save_alarm(name)
+            self.arm_alarms()
+            self.update_alarm_list()
+            self.publish_state()
+    
+    def save_alarm(self, name):
+        """Registra el próximo disparo de una alarma (o que ya no existe)"""
+        self.journal.record(f"alarm:{name}", self.alarms.snapshot(name))
+    
+    def arm_alarms(self):
+        """Programa un único despertar para la alarma más próxima"""
+        self.scheduler.cancel(self.alarm_job)
+        self.alarm_job = None
+        delay = self.alarms.wakeup_delay()
+        if delay is not None:
+            self.alarm_job = self.scheduler.call_later(delay, self.check_alarms)
+    
+    def check_alarms(self):
+        """Hace sonar las alarmas vencidas y reprograma; detecta suspensiones y cambios de hora"""
+        self.scheduler.cancel(self.alarm_job)
+        self.alarm_job = None
+        fired, missed, jumped = self.alarms.check()
+        if jumped:
+            # Las recurrentes pudieron cambiar de próximo disparo
+            for alarm in self.alarms.upcoming(len(self.alarms)):
+                self.save_alarm(alarm.name)
+        for name, late in fired:
+            self.save_alarm(name)
+        for name in missed:
+            self.save_alarm(name)
+        self.arm_alarms()
+        if fired or missed:
+            self.publish_state()
+        
+        if (fired or missed or jumped) and not self.is_minimized:
+            self.update_alarm_list()
+        for name, late in fired:
+            # Con retraso (equipo suspendido o app cerrada) se indica cuánto
+            self.notifier.notify(f"🔔 {name}" if late <= CLOCK_TOLERANCE else f"🔔 {name} (+{format_hms(late)})")
+        for name in missed:
+            self.notifier.notify(f"🔔 {name} (perdida)")
+    
+    def update_alarm_list(self):
+        """Muestra las alarmas más próximas con su hora de disparo"""
+        if self.alarm_list is None:
+            # La pestaña todavía no se construyó
+            return
+        upcoming = self.alarms.upcoming(ALARM_ROWS)
+        self.alarm_list.show(
+            [(alarm.name, (alarm.name, alarm.next, alarm.rule is not None)) for alarm in upcoming],
+            len(self.alarms)
+        )
+    
+    def alarm_row_text(self, key):
+        """Texto de una fila de alarma a partir de (nombre, disparo, recurrente)"""
+        name, next_fire, recurring = key
+        return f"{name} — {format_wall(next_fire)}" + (" 🔁" if recurring else "")
+    
+    def show_notification(self, names):
+        """Muestra los vencimientos agrupados sin abrir diálogos modales"""
+        self.banner_names.extend(name for name in names if name not in self.banner_names)
+        self.root.bell()
+        
+        if self.is_minimized:
+            # El banner espera a que se abra la ventana; mientras tanto avisa el tray
+            if self.tray:
+                self.tray.notify(self.banner_text(), config.APP_NAME)
+            if self.notebook is None:
+                return
+        self.place_banner()
+        
+        if not self.is_minimized:
+            self.root.lift()
+            self.root.focus_force()
+            self.schedule_banner_hide()
+    
+    def banner_text(self):
+        """Texto del aviso con todos los vencimientos acumulados"""
+        return "⏰ ¡Tiempo completado! " + ", ".join(self.banner_names)
+    
+    def place_banner(self):
+        """Muestra (o actualiza) el banner de aviso sobre la ventana"""
+        if self.banner is None:
+            # Un botón a todo lo ancho: un clic lo cierra
+            self.banner = ctk.CTkButton(
+                self.root,
+                text="",
+                command=self.dismiss_banner,
+                **styles.button("start"),
+                corner_radius=0,
+                height=28
+            )
+        self.banner.configure(text=f"{self.banner_text()}   ✕")
+        self.banner.place(relx=0, rely=0, relwidth=1.0)
+        self.banner.lift()
+    
+    def schedule_banner_hide(self):
+        """Oculta el banner dentro de BANNER_SECONDS"""
+        self.scheduler.cancel(self.banner_job)
+        self.banner_job = self.scheduler.call_later(BANNER_SECONDS, self.dismiss_banner)
+    
+    def dismiss_banner(self):
+        """Cierra el banner de aviso"""
+        self.scheduler.cancel(self.banner_job)
+        self.banner_job = None
+        self.banner_names = []
+        if self.banner is not None:
+            self.banner.place_forget()
+    
+    def update_multi_timer_list(self):
+        """Muestra los temporizadores más próximos; el costo no depende del total"""
+        self.scheduler.cancel(self.multi_list_job)
+        self.multi_list_job = None
+        if self.multi_list is None:
+            # La pestaña todavía no se construyó
+            return
+        
+        nearest = self.multi_timers.nearest(MULTI_TIMER_ROWS)
+        total = len(self.multi_timers)
+        self.multi_list.show([(name, (name, math.ceil(remaining))) for name, remaining in nearest], total)
+        
+        if total and not self.is_minimized:
+            self.multi_list_job = self.scheduler.call_later(1.0, self.update_multi_timer_list)
+    
+    def multi_row_text(self, key):
+        """Texto de una fila de temporizador múltiple a partir de (nombre, segundos)"""
+        name, remaining = key
+        return f"{name} — {self.format_time(remaining)}"
     
     def minimize_to_tray(self):
         """Minimiza la aplicación al system tray"""
+        if self.tray is None:
+            self.create_tray_icon()
+        
         self.root.withdraw()
         self.is_minimized = True
+        if config.TRAY_LOW_MEMORY:
+            self.release_view()
         
-        # Mostrar el icono en el system tray
-        if self.tray_icon:
-            self.tray_icon.run_detached()
+        # Sin ventana visible no se redibujan labels: solo el tooltip del tray
+        self.scheduler.cancel(self.stopwatch_job)
+        self.stopwatch_job = None
+        self.scheduler.cancel(self.multi_list_job)
+        self.multi_list_job = None
+        if self.timer.running:
+            self.schedule_timer_tick()
+        self.scheduler.cancel(self.tray_refresh_job)
+        self.refresh_tray()
+        
+        # Mostrar el icono: el backend del tray ya corre, solo cambia la visibilidad
+        self.tray.show()
     
     def on_minimize(self, event):
         """Maneja el evento de minimización"""
@@ -440,24 +1563,166 @@ class TimerApp:
     
     def _show_window(self):
         """Muestra la ventana en el hilo principal"""
+        if self.notebook is None:
+            self.rebuild_view()
         self.root.deiconify()
         self.root.lift()
         self.root.focus_force()
         self.is_minimized = False
         
-        # Ocultar el icono del system tray
-        if self.tray_icon:
-            self.tray_icon.stop()
+        # Ponerse al día de inmediato y volver a la frecuencia completa
+        self.scheduler.cancel(self.tray_refresh_job)
+        self.tray_refresh_job = None
+        self.refresh_displays()
+        
+        # Un aviso que llegó minimizado se ve ahora, y desde ahora cuenta su tiempo
+        if self.banner_names:
+            self.schedule_banner_hide()
+        
+        # Ocultar el icono del system tray (el backend sigue vivo)
+        if self.tray:
+            self.tray.hide()
+    
+    def release_view(self):
+        """Destruye el árbol de widgets; los relojes siguen corriendo en el núcleo"""
+        if self.notebook is None:
+            return
+        
+        # Lo que no vive en el núcleo: pestaña seleccionada y valores escritos
+        self.saved_view = {
+            "tab": self.notebook.index(self.notebook.select()),
+            "inputs": (self.hours_var.get(), self.minutes_var.get(), self.seconds_var.get()),
+        }
+        if self.debug_overlay is not None:
+            self.toggle_debug_overlay()
+        self.close_presentation()
+        self.scheduler.cancel(self.banner_job)
+        self.banner_job = None
+        
+        for child in self.root.winfo_children():
+            child.destroy()
+        self.notebook = None
+        self.timer_label = None
+        self.stopwatch_label = None
+        self.laps_view = None
+        self.export_btn = None
+        self.multi_list = None
+        self.alarm_list = None
+        self.banner = None
+        
+        # Los widgets de CustomTkinter forman ciclos de referencias
+        gc.collect()
+    
+    def rebuild_view(self):
+        """Reconstruye la ventana desde el estado del núcleo"""
+        self.setup_ui()
+        self.sync_timer_view()
+        
+        saved, self.saved_view = self.saved_view, None
+        if saved is not None:
+            for var, value in zip((self.hours_var, self.minutes_var, self.seconds_var), saved["inputs"]):
+                var.set(value)
+            if saved["tab"]:
+                self.notebook.select(saved["tab"])
+                self.on_tab_changed()
+        
+        if self.banner_names:
+            self.place_banner()
+    
+    def refresh_displays(self):
+        """Redibuja ambos displays desde el estado actual y reanuda los ticks"""
+        self.scheduler.cancel(self.timer_job)
+        self.timer_job = None
+        self.scheduler.cancel(self.stopwatch_job)
+        self.stopwatch_job = None
+        
+        if self.timer.running:
+            self.timer_countdown()
+        if self.stopwatch.running:
+            self.stopwatch_count()
+        self.update_multi_timer_list()
+        if len(self.alarms):
+            # Al volver (quizás tras una suspensión) no se espera al próximo despertar
+            self.check_alarms()
+        self.update_alarm_list()
+    
+    def refresh_tray(self):
+        """Refresco de bajo consumo (una vez por segundo) mientras está en el tray"""
+        self.tray_refresh_job = None
+        if not self.is_minimized:
+            return
+        
+        parts = []
+        phase = self.timer_phase()
+        if phase is not None and self.timer.running:
+            parts.append(f"⏰ {phase[1]} {self.format_time(math.ceil(phase[2]))}")
+        elif self.timer.running:
+            parts.append(f"⏰ {self.format_time(self.timer.remaining_seconds())}")
+        if self.stopwatch.running:
+            parts.append(f"⏱️ {self.format_time(self.stopwatch.elapsed())}")
+        nearest = self.multi_timers.nearest(1)
+        if nearest:
+            name, remaining = nearest[0]
+            parts.append(f"⏲️ {name} {self.format_time(math.ceil(remaining))}")
+        
+        if self.tray:
+            self.tray.set_title(" | ".join(parts) or "Temporizador & Cronómetro")
+            self.update_tray_progress()
+            self.update_tray_menu()
+        
+        if parts:
+            self.tray_refresh_job = self.scheduler.call_later(1.0, self.refresh_tray)
+    
+    def update_tray_progress(self):
+        """Muestra el anillo de progreso; solo cambia el icono si cambió el cuadro"""
+        if self.tray is None:
+            return
+        
+        if self.timer.running and self.tray_progress_frames:
+            steps = len(self.tray_progress_frames) - 1
+            frame = min(steps, math.ceil(self.timer.fraction_remaining() * steps))
+            image = self.tray_progress_frames[frame]
+        else:
+            frame = None
+            image = self.tray_default_image
+        
+        if frame != self.tray_frame:
+            self.tray_frame = frame
+            self.tray.set_image(image)
+    
+    def update_tray_menu(self):
+        """Reconstruye el menú del tray solo si cambió el estado que muestra"""
+        state = (self.timer.state, self.stopwatch.state)
+        if state != self.tray_menu_state:
+            self.tray_menu_state = state
+            self.tray.update_menu()
+    
+    def tray_toggle_timer(self, icon=None, item=None):
+        """Pausa o continúa el temporizador desde el menú del tray"""
+        self.root.after(0, self._toggle_from_tray, self.pause_timer if self.timer.running else self.start_timer)
+    
+    def tray_toggle_stopwatch(self, icon=None, item=None):
+        """Pausa o continúa el cronómetro desde el menú del tray"""
+        self.root.after(0, self._toggle_from_tray, self.pause_stopwatch if self.stopwatch.running else self.start_stopwatch)
+    
+    def _toggle_from_tray(self, action):
+        """Ejecuta la acción en el hilo principal y refresca el tray al momento"""
+        action()
+        if self.is_minimized:
+            self.scheduler.cancel(self.tray_refresh_job)
+            self.refresh_tray()
     
     def quit_app(self, icon=None, item=None):
         """Cierra la aplicación completamente"""
-        # Detener todos los hilos
-        self.timer_running = False
-        self.stopwatch_running = False
+        # No perder las vueltas que quedan en el buffer de exportación
+        self.stop_export()
+        self.journal.close()
+        if self.control is not None:
+            self.control.stop()
         
-        # Ocultar el icono del system tray
-        if self.tray_icon:
-            self.tray_icon.stop()
+        # Detener el backend del system tray
+        if self.tray:
+            self.tray.stop()
         
         # Cerrar la aplicación
         self.root.quit()
@@ -466,53 +1731,177 @@ class TimerApp:
     
     def create_tray_icon(self):
         """Crea el icono del system tray"""
+        # Import diferido: pystray y PIL no cuentan en el tiempo de arranque
+        import pystray
+        from pystray import MenuItem as item
+        
+        from tray_icons import progress_ring_atlas, tray_icon_size
+        from tray_manager import TrayManager
+        
         # Crear un icono simple (puedes reemplazarlo con tu propio icono)
         icon_image = self.create_default_icon()
+        self.tray_default_image = icon_image
+        
+        # Anillo de progreso del temporizador: todos los cuadros se dibujan ahora
+        scale = self.root.winfo_fpixels('1i') / 96
+        self.tray_progress_frames = progress_ring_atlas(tray_icon_size(scale))
         
-        # Crear el menú del system tray
+        # Crear el menú del system tray; los textos se evalúan en update_menu()
         menu = pystray.Menu(
-            item('Mostrar', self.show_window),
+            item('Mostrar', self.show_window, default=True),
+            item(
+                lambda i: '⏸️ Pausar temporizador' if self.timer.running else '▶️ Continuar temporizador',
+                self.tray_toggle_timer,
+                visible=lambda i: self.timer.state != IDLE
+            ),
+            item(
+                lambda i: '⏸️ Pausar cronómetro' if self.stopwatch.running else '▶️ Continuar cronómetro',
+                self.tray_toggle_stopwatch,
+                visible=lambda i: self.stopwatch.state != IDLE
+            ),
+            pystray.Menu.SEPARATOR,
             item('Salir', self.quit_app)
         )
         
-        # Crear el icono del system tray
-        self.tray_icon = pystray.Icon(
+        # Crear el icono del system tray: su backend se arranca una sola vez
+        self.tray = TrayManager(pystray.Icon(
             "timer_app",
             icon_image,
             "Temporizador & Cronómetro",
             menu
-        )
+        ))
         
     def create_default_icon(self):
-        """Crea un icono por defecto para el system tray"""
-        # Crear un icono simple de 16x16 píxeles
-        width = 16
-        height = 16
-        
-        # Crear una imagen con un círculo azul
-        image = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        
-        # Crear un círculo azul simple
-        for x in range(width):
-            for y in range(height):
-                # Calcular distancia desde el centro
-                center_x, center_y = width // 2, height // 2
-                distance = ((x - center_x) ** 2 + (y - center_y) ** 2) ** 0.5
-                
-                if distance <= width // 2:
-                    # Color azul para el círculo
-                    image.putpixel((x, y), (0, 120, 255, 255))
-        
-        return image
+        """Icono por defecto para el system tray, según la escala de la pantalla"""
+        from tray_icons import tray_icon_for_scale
+        
+        scale = self.root.winfo_fpixels('1i') / 96
+        return tray_icon_for_scale(scale)
+    
+    def toggle_presentation(self, event=None):
+        """Abre o cierra la vista de presentación a pantalla completa (F11)"""
+        if self.presentation is not None:
+            self.close_presentation()
+            return
+        
+        from canvas_clock import GlyphClock
+        
+        # Se presenta el reloj de la pestaña seleccionada
+        if self.notebook.select() == str(self.stopwatch_frame):
+            self.presentation_source = "stopwatch"
+            text, color = self.stopwatch_format(0), "cyan"
+        else:
+            self.presentation_source = "timer"
+            text, color = "00:00:00", "lime"
+        
+        self.presentation = tk.Toplevel(self.root, bg="black")
+        self.presentation.attributes("-fullscreen", True)
+        for sequence in ("<Escape>", "<F11>", "<Button-1>"):
+            self.presentation.bind(sequence, lambda event: self.close_presentation())
+        
+        # Lo más grande que entra a lo ancho (11 caracteres de ~0.6 del tamaño)
+        size = min(self.root.winfo_screenheight() // 3, self.root.winfo_screenwidth() * 9 // 70)
+        self.presentation_clock = GlyphClock(self.presentation, size=size, color=color, bg="black", text=text,
+                                             probe=self.probe, name="presentation")
+        self.presentation_clock.place(relx=0.5, rely=0.5, anchor="center")
+        self.presentation.focus_force()
+        self.presentation_tick()
+    
+    def presentation_tick(self):
+        """Actualiza la vista de presentación: cada cuadro si corre el cronómetro"""
+        self.presentation_job = None
+        if self.presentation is None:
+            return
+        
+        if self.presentation_source == "stopwatch":
+            self.presentation_clock.show_key(self.stopwatch.elapsed_ns() // self.stopwatch_unit_ns, self.stopwatch_format)
+            running = self.stopwatch.running
+            delay = 1 / config.CLOCK_FPS
+        else:
+            remaining = self.timer_display_seconds()
+            color = "lime" if self.timer.state == IDLE else self.timer_color(remaining)
+            self.presentation_clock.show_key(remaining, format_hms, color)
+            running = self.timer.running
+            delay = timer_tick_delay(self.timer, self.program) if running else 0
+        
+        # Detenido: sondeo lento por si se inicia desde el tray o la API de control
+        self.presentation_job = self.scheduler.call_later(delay if running else 0.25, self.presentation_tick)
+    
+    def close_presentation(self):
+        """Cierra la vista de presentación"""
+        self.scheduler.cancel(self.presentation_job)
+        self.presentation_job = None
+        if self.presentation is not None:
+            self.presentation.destroy()
+            self.presentation = None
+            self.presentation_clock = None
+    
+    def toggle_debug_overlay(self, event=None):
+        """Muestra u oculta el overlay de instrumentación (F12)"""
+        if self.debug_overlay is not None:
+            self.scheduler.cancel(self.debug_overlay_job)
+            self.debug_overlay_job = None
+            self.debug_overlay.destroy()
+            self.debug_overlay = None
+            self.probe.enabled = self.profile_default
+            return
+        
+        self.probe.enabled = True
+        self.debug_overlay = ctk.CTkLabel(
+            self.root,
+            text="",
+            font=styles.font("mono"),
+            fg_color="black",
+            text_color="lime",
+            justify="left",
+            anchor="nw"
+        )
+        self.debug_overlay.place(relx=1.0, rely=0.0, anchor="ne")
+        self.update_debug_overlay()
+    
+    def update_debug_overlay(self):
+        """Refresca el overlay una vez por segundo"""
+        self.debug_overlay_job = None
+        if self.debug_overlay is None:
+            return
+        self.debug_overlay.configure(text=self.probe.summary())
+        self.debug_overlay_job = self.scheduler.call_later(1.0, self.update_debug_overlay)
+    
+    def dump_instrumentation(self, event=None):
+        """Guarda un snapshot JSON de la instrumentación (Ctrl+Shift+D)"""
+        folder = os.path.dirname(self.journal.path)
+        path = os.path.join(folder, f"instrumentation-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        try:
+            os.makedirs(folder, exist_ok=True)
+            self.probe.dump(path)
+        except OSError as e:
+            messagebox.showerror("Error", f"No se pudo guardar la instrumentación:\n{e}")
+            return
+        messagebox.showinfo("Instrumentación", f"Snapshot guardado en:\n{path}")
     
     def run(self):
         """Ejecuta la aplicación"""
+        self.root.after_idle(self.on_first_frame)
         self.root.mainloop()
+    
+    def on_first_frame(self):
+        """Primer ciclo ocioso del bucle principal: la ventana ya está dibujada"""
+        startup_trace.mark("first frame")
+        startup_trace.report()
+        
+        # Fuera del presupuesto de arranque: asyncio se importa recién ahora
+        if config.CONTROL_API_ENABLED:
+            self.start_control_api()
 
-def main():
+def main(instance=None):
     """Función principal"""
+    if instance is None:
+        instance = claim_instance(sys.argv[1:])
     app = TimerApp()
+    instance.serve(app.post_command)
+    if instance.args.start:
+        app.run_command({"start": instance.args.start})
     app.run()
 
 if __name__ == "__main__":
-    main()
+    main(_INSTANCE)
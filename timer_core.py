@@ -0,0 +1,296 @@
+"""
+Núcleo del temporizador y el cronómetro sin interfaz gráfica (no importa Tk)
+"""
+
+import heapq
+import itertools
+import math
+import time
+
+from laps import LapStore
+
+IDLE = "idle"
+RUNNING = "running"
+PAUSED = "paused"
+
+# Unidades por segundo de cada modo del display del cronómetro
+STOPWATCH_SCALES = {"tenths": 10, "centiseconds": 100, "milliseconds": 1000}
+
+def time_to_next_tick(remaining):
+    """Tiempo hasta que `remaining` (cuenta regresiva) cambie de segundo entero"""
+    delay = remaining - math.floor(remaining)
+    return delay if delay > 0 else min(1.0, remaining)
+
+def timer_phase(timer, program):
+    """(índice, nombre, restante) de la fase de `program` en curso, o None"""
+    if program is None or timer.state == IDLE:
+        return None
+    return program.locate(timer.duration - timer.remaining())
+
+def timer_tick_delay(timer, program=None, minimized=False):
+    """Espera hasta el próximo tick del temporizador (o de la fase del programa)
+
+    Con la ventana visible es el próximo cambio de segundo del display; oculta,
+    solo hace falta despertar al terminar o al cambiar de fase.
+    """
+    phase = timer_phase(timer, program)
+    remaining = timer.remaining() if phase is None else phase[2]
+    return remaining if minimized else time_to_next_tick(remaining)
+
+def stopwatch_step(scale, fps):
+    """Período del tick del cronómetro: una décima, o un cuadro si muestra más"""
+    return 0.1 if scale <= 10 else 1 / fps
+
+def stopwatch_tick_delay(elapsed_ns, step):
+    """Espera hasta el próximo límite de `step` segundos del cronómetro"""
+    return step - (elapsed_ns / 1e9) % step
+
+class Timer:
+    """Cuenta regresiva basada en una fecha límite absoluta del reloj inyectado"""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        """Deja el temporizador detenido y sin tiempo"""
+        self.state = IDLE
+        self.duration = 0.0
+        self.deadline = None
+        self.paused_offset = 0.0
+        self.paused_at = None
+
+    def start(self, seconds):
+        """Arranca una cuenta regresiva de `seconds` segundos desde ahora"""
+        self.state = RUNNING
+        self.duration = seconds
+        self.deadline = self.clock() + seconds
+        self.paused_offset = 0.0
+        self.paused_at = None
+
+    def pause(self):
+        """Congela el tiempo restante"""
+        if self.state == RUNNING:
+            self.state = PAUSED
+            self.paused_at = self.clock()
+
+    def resume(self):
+        """Reanuda acumulando el tiempo que estuvo en pausa"""
+        if self.state == PAUSED:
+            self.state = RUNNING
+            self.paused_offset += self.clock() - self.paused_at
+            self.paused_at = None
+
+    @property
+    def running(self):
+        return self.state == RUNNING
+
+    @property
+    def paused(self):
+        return self.state == PAUSED
+
+    def remaining(self):
+        """Segundos restantes (con decimales) calculados desde la fecha límite"""
+        if self.deadline is None:
+            return 0.0
+        now = self.paused_at if self.paused_at is not None else self.clock()
+        return max(0.0, self.deadline + self.paused_offset - now)
+
+    def remaining_seconds(self):
+        """Segundos enteros a mostrar (redondeo hacia arriba)"""
+        return math.ceil(self.remaining())
+
+    def fraction_remaining(self):
+        """Fracción restante del total, entre 0 y 1"""
+        if self.duration <= 0:
+            return 0.0
+        return min(1.0, self.remaining() / self.duration)
+
+    def expired(self):
+        """True si está corriendo y ya llegó a cero"""
+        return self.state == RUNNING and self.remaining() <= 0
+
+    def time_to_next_tick(self):
+        """Tiempo hasta el próximo cambio de segundo entero del display"""
+        return time_to_next_tick(self.remaining())
+
+    def snapshot(self):
+        """Estado serializable, o None si está detenido"""
+        if self.state == IDLE:
+            return None
+        return {"state": self.state, "remaining": self.remaining(), "duration": self.duration}
+
+    def restore(self, snapshot):
+        """Vuelve al estado de `snapshot` (tiempo restante ya ajustado)"""
+        self.reset()
+        if snapshot is None:
+            return
+        self.start(snapshot["remaining"])
+        self.duration = snapshot.get("duration", snapshot["remaining"])
+        if snapshot["state"] == PAUSED:
+            self.pause()
+
+class Stopwatch:
+    """Cronómetro en nanosegundos enteros (perf_counter_ns); incluye sus vueltas
+
+    El tiempo se acumula como entero entre pausas, así que pausar y continuar
+    no agrega error de redondeo, y el reloj de alta resolución no salta con
+    los ajustes de la hora del sistema.
+    """
+
+    def __init__(self, clock=time.perf_counter_ns):
+        self.clock = clock
+        self.laps = LapStore()
+        self.reset()
+
+    def reset(self):
+        """Vuelve a cero y borra las vueltas"""
+        self.state = IDLE
+        self.accumulated_ns = 0
+        self.started_ns = None
+        self.laps.clear()
+
+    def start(self):
+        """Inicia o continúa"""
+        if self.state != RUNNING:
+            self.state = RUNNING
+            self.started_ns = self.clock()
+
+    def pause(self):
+        """Detiene el avance conservando lo acumulado"""
+        if self.state == RUNNING:
+            self.accumulated_ns += self.clock() - self.started_ns
+            self.started_ns = None
+            self.state = PAUSED
+
+    @property
+    def running(self):
+        return self.state == RUNNING
+
+    @property
+    def paused(self):
+        return self.state == PAUSED
+
+    def elapsed_ns(self, now=None):
+        """Nanosegundos transcurridos en total (hasta `now` del reloj, si se indica)"""
+        if self.state == RUNNING:
+            return self.accumulated_ns + ((self.clock() if now is None else now) - self.started_ns)
+        return self.accumulated_ns
+
+    def elapsed(self):
+        """Segundos transcurridos en total"""
+        return self.elapsed_ns() / 1e9
+
+    def lap(self, at=None):
+        """Marca una vuelta en el instante `at` del reloj (por defecto, ahora)
+
+        Devuelve (número, acumulado, parcial) en segundos, o None si no corre.
+        """
+        if self.state != RUNNING:
+            return None
+        cumulative = self.elapsed_ns(at) / 1e9
+        split = self.laps.add(cumulative)
+        return len(self.laps), cumulative, split
+
+    def snapshot(self):
+        """Estado serializable (con los acumulados de las vueltas), o None si está en cero"""
+        if self.state == IDLE:
+            return None
+        snapshot = {"state": self.state, "elapsed": self.elapsed()}
+        if len(self.laps):
+            snapshot["laps"] = list(self.laps.cumulative)
+        return snapshot
+
+    def restore(self, snapshot):
+        """Vuelve al estado de `snapshot` (tiempo transcurrido ya ajustado)"""
+        self.reset()
+        if snapshot is None:
+            return
+        # Los parciales y las estadísticas se recalculan desde los acumulados
+        for cumulative in snapshot.get("laps", ()):
+            self.laps.add(cumulative)
+        self.accumulated_ns = round(snapshot["elapsed"] * 1e9)
+        self.state = PAUSED
+        if snapshot["state"] == RUNNING:
+            self.start()
+
+class MainLoopScheduler:
+    """Planificador único de ticks sobre un `host` con after/after_cancel (p. ej. Tk)"""
+
+    def __init__(self, host, clock=time.monotonic, probe=None):
+        self.host = host
+        self.clock = clock
+        self.probe = probe        # instrumentación opcional (ver instrumentation.py)
+        self._queue = []          # heap de (instante, id, callback)
+        self._pending = set()     # ids en el heap que todavía deben ejecutarse
+        self._cancelled = set()   # ids cancelados que siguen en el heap
+        self._ids = itertools.count()
+        self._after_id = None
+        self._wakeup_at = None
+
+    def __len__(self):
+        """Trabajos programados que todavía no se ejecutaron ni se cancelaron"""
+        return len(self._pending)
+
+    def call_at(self, when, callback):
+        """Programa `callback` para el instante `when` del reloj y devuelve su id"""
+        if not math.isfinite(when):
+            # Un instante infinito rompería el host.after y frenaría todos los relojes
+            raise ValueError("el instante debe ser finito")
+        job_id = next(self._ids)
+        heapq.heappush(self._queue, (when, job_id, callback))
+        self._pending.add(job_id)
+        if self._wakeup_at is None or when < self._wakeup_at:
+            self._arm()
+        return job_id
+
+    def call_later(self, delay, callback):
+        """Programa `callback` dentro de `delay` segundos"""
+        return self.call_at(self.clock() + delay, callback)
+
+    def cancel(self, job_id):
+        """Cancela un trabajo programado (si todavía no se ejecutó)"""
+        # Un id que ya corrió (o se canceló) no se recuerda: el conjunto no crece
+        if job_id in self._pending:
+            self._pending.discard(job_id)
+            self._cancelled.add(job_id)
+
+    def _arm(self):
+        """Deja un único host.after pendiente para el trabajo más próximo"""
+        if self._after_id is not None:
+            self.host.after_cancel(self._after_id)
+            self._after_id = None
+
+        # Descartar trabajos cancelados que estén al frente
+        while self._queue and self._queue[0][1] in self._cancelled:
+            self._cancelled.discard(heapq.heappop(self._queue)[1])
+
+        if not self._queue:
+            self._wakeup_at = None
+            return
+
+        self._wakeup_at = self._queue[0][0]
+        delay_ms = max(0, math.ceil((self._wakeup_at - self.clock()) * 1000))
+        self._after_id = self.host.after(delay_ms, self._dispatch)
+
+    def _dispatch(self):
+        """Ejecuta todos los trabajos vencidos y vuelve a armar el despertador"""
+        self._after_id = None
+        now = self.clock()
+        due = []
+        while self._queue and self._queue[0][0] <= now:
+            due.append(heapq.heappop(self._queue))
+
+        # Rearmar antes de ejecutar: un callback que abra un diálogo modal
+        # no debe frenar al resto de los relojes
+        self._arm()
+
+        for when, job_id, callback in due:
+            if job_id in self._cancelled:
+                self._cancelled.discard(job_id)
+                continue
+            self._pending.discard(job_id)
+            if self.probe is not None and self.probe.enabled:
+                self.probe.run_scheduled(callback, now - when)
+            else:
+                callback()
@@ -0,0 +1,83 @@
+"""
+Iconos de la aplicación dibujados con primitivas de PIL y cacheados por tamaño
+"""
+
+import functools
+
+from PIL import Image, ImageDraw
+
+import config
+
+# Tamaños generados (incluye los de pantallas HiDPI: 125%, 150%, 200%...)
+ICON_SIZES = (16, 20, 24, 32, 40, 48, 64, 128, 256)
+# Se dibuja a mayor resolución y se reduce para suavizar los bordes
+SUPERSAMPLE = 4
+# Cuadros del anillo de progreso (el cuadro 0 es el anillo vacío)
+PROGRESS_STEPS = 64
+# Color de la parte ya consumida del anillo
+RING_TRACK_COLOR = (80, 80, 80, 255)
+
+@functools.lru_cache(maxsize=None)
+def tray_icon_image(size=config.TRAY_ICON_SIZE):
+    """Círculo del system tray de `size` píxeles (se construye una sola vez)"""
+    big = size * SUPERSAMPLE
+    image = Image.new("RGBA", (big, big), (0, 0, 0, 0))
+    ImageDraw.Draw(image).ellipse((0, 0, big - 1, big - 1), fill=config.TRAY_ICON_COLOR)
+    return image.resize((size, size), Image.LANCZOS)
+
+def tray_icon_size(scale=1.0):
+    """Tamaño del icono del tray para un factor de escala de pantalla"""
+    wanted = config.TRAY_ICON_SIZE * scale
+    return next((s for s in ICON_SIZES if s >= wanted), ICON_SIZES[-1])
+
+def tray_icon_for_scale(scale=1.0):
+    """Icono del tray adecuado para un factor de escala de pantalla"""
+    return tray_icon_image(tray_icon_size(scale))
+
+@functools.lru_cache(maxsize=None)
+def progress_ring_atlas(size=config.TRAY_ICON_SIZE, steps=PROGRESS_STEPS):
+    """Todos los cuadros del anillo de progreso, prerenderizados una sola vez"""
+    big = size * SUPERSAMPLE
+    thickness = max(SUPERSAMPLE, big // 4)
+    inner = (thickness, thickness, big - 1 - thickness, big - 1 - thickness)
+    frames = []
+    for step in range(steps + 1):
+        image = Image.new("RGBA", (big, big), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+        draw.ellipse((0, 0, big - 1, big - 1), fill=RING_TRACK_COLOR)
+        if step:
+            # Desde las 12 en punto en sentido horario
+            draw.pieslice((0, 0, big - 1, big - 1), -90, -90 + 360 * step / steps,
+                          fill=config.TRAY_ICON_COLOR)
+        # Perforar el centro: ImageDraw escribe el alfa 0 tal cual
+        draw.ellipse(inner, fill=(0, 0, 0, 0))
+        frames.append(image.resize((size, size), Image.LANCZOS))
+    return tuple(frames)
+
+@functools.lru_cache(maxsize=None)
+def app_icon_image(size=256):
+    """Icono de reloj de la aplicación (el mismo que usa el instalador)"""
+    image = Image.new("RGBA", (256, 256), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+
+    # Círculo azul (representando un cronómetro)
+    center = (128, 128)
+    radius = 100
+    draw.ellipse([center[0] - radius, center[1] - radius, center[0] + radius, center[1] + radius],
+                 fill=(70, 130, 180, 255), outline=(0, 0, 139, 255), width=3)
+
+    # Manecillas: segundos (roja), minutos (azul) y horas (negra)
+    draw.line([center, (center[0], center[1] - 80)], fill=(255, 0, 0, 255), width=3)
+    draw.line([center, (center[0] + 40, center[1])], fill=(0, 0, 139, 255), width=4)
+    draw.line([center, (center[0], center[1] + 30)], fill=(0, 0, 0, 255), width=5)
+
+    # Punto central
+    draw.ellipse([center[0] - 5, center[1] - 5, center[0] + 5, center[1] + 5], fill=(0, 0, 0, 255))
+
+    if size != 256:
+        image = image.resize((size, size), Image.LANCZOS)
+    return image
+
+def save_app_icon(path):
+    """Guarda el icono de la aplicación como .ico multirresolución"""
+    app_icon_image().save(path, format="ICO", sizes=[(s, s) for s in ICON_SIZES])
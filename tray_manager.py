@@ -0,0 +1,75 @@
+"""
+Icono del system tray de larga vida: el backend de pystray se arranca una sola vez
+"""
+
+import threading
+
+class TrayManager:
+    """Un único pystray.Icon que se muestra u oculta sin detener su hilo"""
+
+    def __init__(self, icon):
+        self.icon = icon
+        self._lock = threading.Lock()
+        self._started = False
+        self._ready = False       # el backend terminó de arrancar
+        self._visible = False     # visibilidad deseada
+        self._title = icon.title
+        self._image = icon.icon
+
+    def _setup(self, icon):
+        """Se ejecuta en el hilo del tray cuando el backend está listo"""
+        with self._lock:
+            self._ready = True
+            icon.visible = self._visible
+
+    def _set_visible(self, visible):
+        with self._lock:
+            self._visible = visible
+            if not self._started:
+                self._started = True
+                start = True
+            else:
+                start = False
+                if self._ready and self.icon.visible != visible:
+                    self.icon.visible = visible
+        # Fuera del lock: _setup lo toma desde el hilo del tray
+        if start:
+            self.icon.run_detached(self._setup)
+
+    def show(self):
+        """Muestra el icono (arranca el backend la primera vez)"""
+        self._set_visible(True)
+
+    def hide(self):
+        """Oculta el icono sin detener el backend"""
+        self._set_visible(False)
+
+    def set_title(self, title):
+        """Cambia el tooltip solo si es distinto"""
+        if title != self._title:
+            self._title = title
+            self.icon.title = title
+
+    def set_image(self, image):
+        """Cambia la imagen solo si es otra"""
+        if image is not self._image:
+            self._image = image
+            self.icon.icon = image
+
+    def update_menu(self):
+        """Vuelve a evaluar textos y visibilidad de las entradas del menú"""
+        if self._ready:
+            self.icon.update_menu()
+
+    def notify(self, message, title=None):
+        """Notificación del sistema, si el backend la soporta"""
+        if self._ready and self._visible and getattr(self.icon, "HAS_NOTIFICATION", False):
+            self.icon.notify(message, title)
+
+    def stop(self):
+        """Detiene el backend; solo al salir de la aplicación"""
+        with self._lock:
+            started = self._started
+            self._started = self._ready = False
+        if started:
+            self.icon.stop()